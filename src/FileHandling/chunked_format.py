@@ -0,0 +1,227 @@
+"""
+Chunked image container (".psec") with optional per-chunk compression.
+
+Layout (little endian):
+    header  : magic "PSEC", version (u8), codec (u8), dtype (8 ASCII bytes,
+              numpy dtype string), height, width, chunk height, chunk width (u32)
+    index   : one (offset, length) u64 pair per chunk, row-major chunk order
+    payload : the chunks, each one a C-ordered array with its clipped shape
+              (chunks on the right/bottom edges may be smaller)
+
+Each chunk can be read on its own, so tiled and streaming code only touches
+the chunks it needs. The bytes actually read from disk (header, index and
+every chunk payload) are recorded as telemetry "io" events.
+"""
+
+# Native Modules:
+import struct
+import zlib
+from pathlib import Path
+
+# Internal Modules:
+import PSE.telemetry as TEL
+
+# External Modules:
+import numpy as np
+
+
+MAGIC:bytes         = b"PSEC"
+VERSION:int         = 1
+FILE_EXTENSION:str  = ".psec"
+
+CODECS:dict[str, int]   = {"none": 0, "zlib": 1}    # Codec name -> header code.
+DEFAULT_CHUNK_SHAPE:tuple[int, int] = (256, 256)
+ZLIB_LEVEL:int          = 1                         # Fast compression level.
+
+_HEADER = struct.Struct("<4sBB8sIIII")
+_INDEX_ENTRY = struct.Struct("<QQ")
+
+
+def _chunk_grid(shape:tuple[int, int], chunk_shape:tuple[int, int]) -> tuple[int, int]:
+    return (-(-shape[0] // chunk_shape[0]), -(-shape[1] // chunk_shape[1]))
+
+
+def write_chunked(
+    file_path:str|Path,
+    image:np.ndarray,
+    chunk_shape:tuple[int, int]=DEFAULT_CHUNK_SHAPE,
+    compression:str="zlib",
+) -> int:
+    """
+    Writes a 2D image to a chunked container file.
+
+    Parameters:
+        - file_path: Output file path.
+        - image: 2D numpy array (any fixed-size dtype).
+        - chunk_shape: Optional -> (rows, columns) of each chunk.
+        - compression: Optional -> "zlib" (fast, level 1) or "none".
+
+    Return:
+        Number of bytes written.
+    """
+
+    if compression not in CODECS:
+        raise ValueError(f"Unknown compression: {compression}")
+    if image.ndim != 2:
+        raise ValueError("Only 2D images can be stored.")
+
+    ch, cw = int(chunk_shape[0]), int(chunk_shape[1])
+    if ch <= 0 or cw <= 0:
+        raise ValueError("Chunk dimensions must be positive!")
+
+    h, w = image.shape
+    rows, cols = _chunk_grid((h, w), (ch, cw))
+    dtype = image.dtype.str.encode("ascii")
+
+    payloads:list[bytes] = []
+    for cy in range(rows):
+        for cx in range(cols):
+            data = np.ascontiguousarray(image[cy * ch:(cy + 1) * ch, cx * cw:(cx + 1) * cw]).tobytes()
+            if compression == "zlib":
+                data = zlib.compress(data, ZLIB_LEVEL)
+            payloads.append(data)
+
+    offset = _HEADER.size + _INDEX_ENTRY.size * len(payloads)
+    index = bytearray()
+    for data in payloads:
+        index += _INDEX_ENTRY.pack(offset, len(data))
+        offset += len(data)
+
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, CODECS[compression], dtype, h, w, ch, cw))
+        f.write(index)
+        for data in payloads:
+            f.write(data)
+
+    return offset
+
+
+class ChunkedFile:
+    """
+    Random-access reader of a chunked container file.
+
+    Attributes:
+        - `shape`: Image shape (height, width).
+        - `dtype`: Image numpy dtype.
+        - `chunk_shape`: Nominal chunk shape (rows, columns).
+        - `grid`: Number of chunks (rows, columns).
+        - `compression`: Codec name.
+
+    Methods:
+        - `read_chunk`: Reads one chunk.
+        - `read_region`: Reads a rectangular region (only the chunks it touches).
+        - `read_all`: Reads the whole image.
+    """
+
+    def __init__(self, file_path:str|Path) -> None:
+        """
+        Parses the header and chunk index of `file_path`.
+        """
+
+        self.file_path = Path(file_path)
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"File not found: {self.file_path}")
+
+        with open(self.file_path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"Truncated chunked image header: {self.file_path}")
+
+            magic, version, codec, dtype, h, w, ch, cw = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"Not a chunked image file: {self.file_path}")
+            if version != VERSION:
+                raise ValueError(f"Unsupported chunked image version: {version}")
+
+            names = {code: name for name, code in CODECS.items()}
+            if codec not in names:
+                raise ValueError(f"Unknown chunk compression code: {codec}")
+
+            self.shape:tuple[int, int]          = (h, w)
+            self.dtype:np.dtype                 = np.dtype(dtype.rstrip(b"\0 ").decode("ascii"))
+            self.chunk_shape:tuple[int, int]    = (ch, cw)
+            self.grid:tuple[int, int]           = _chunk_grid(self.shape, self.chunk_shape)
+            self.compression:str                = names[codec]
+
+            count = self.grid[0] * self.grid[1]
+            raw_index = f.read(_INDEX_ENTRY.size * count)
+            if len(raw_index) != _INDEX_ENTRY.size * count:
+                raise ValueError(f"Truncated chunk index: {self.file_path}")
+
+        TEL.io_bytes("read", len(header) + len(raw_index), self.file_path)
+        self._index:list[tuple[int, int]] = [
+            _INDEX_ENTRY.unpack_from(raw_index, i * _INDEX_ENTRY.size) for i in range(count)
+        ]
+
+    def _chunk_bounds(self, cy:int, cx:int) -> tuple[int, int, int, int]:
+        ch, cw = self.chunk_shape
+        y0, x0 = cy * ch, cx * cw
+        return y0, min(y0 + ch, self.shape[0]), x0, min(x0 + cw, self.shape[1])
+
+    def _read_chunk(self, f, cy:int, cx:int) -> np.ndarray:
+        y0, y1, x0, x1 = self._chunk_bounds(cy, cx)
+        offset, length = self._index[cy * self.grid[1] + cx]
+
+        f.seek(offset)
+        data = f.read(length)
+        TEL.io_bytes("read", len(data), self.file_path)
+        if self.compression == "zlib":
+            data = zlib.decompress(data)
+
+        expected = (y1 - y0) * (x1 - x0) * self.dtype.itemsize
+        if len(data) != expected:
+            raise ValueError(f"Corrupted chunk ({cy}, {cx}) in {self.file_path}")
+
+        return np.frombuffer(data, dtype=self.dtype).reshape((y1 - y0, x1 - x0))
+
+    def read_chunk(self, cy:int, cx:int) -> np.ndarray:
+        """
+        Reads chunk (`cy`, `cx`) of the grid.
+
+        Return:
+            Read-only array with the chunk data (edge chunks may be smaller).
+        """
+
+        if not (0 <= cy < self.grid[0] and 0 <= cx < self.grid[1]):
+            raise IndexError(f"Chunk ({cy}, {cx}) outside of grid {self.grid}")
+
+        with open(self.file_path, "rb") as f:
+            return self._read_chunk(f, cy, cx)
+
+    def read_region(self, y0:int, y1:int, x0:int, x1:int) -> np.ndarray:
+        """
+        Reads rows [y0, y1) and columns [x0, x1) of the image, decoding only
+        the chunks that intersect the region.
+        """
+
+        h, w = self.shape
+        y0, y1 = max(0, y0), min(h, y1)
+        x0, x1 = max(0, x0), min(w, x1)
+        if y0 >= y1 or x0 >= x1:
+            return np.empty((max(0, y1 - y0), max(0, x1 - x0)), dtype=self.dtype)
+
+        ch, cw = self.chunk_shape
+        out = np.empty((y1 - y0, x1 - x0), dtype=self.dtype)
+
+        with open(self.file_path, "rb") as f:
+            for cy in range(y0 // ch, (y1 - 1) // ch + 1):
+                for cx in range(x0 // cw, (x1 - 1) // cw + 1):
+                    chunk = self._read_chunk(f, cy, cx)
+                    by0, by1, bx0, bx1 = self._chunk_bounds(cy, cx)
+                    oy0, oy1 = max(y0, by0), min(y1, by1)
+                    ox0, ox1 = max(x0, bx0), min(x1, bx1)
+                    out[oy0 - y0:oy1 - y0, ox0 - x0:ox1 - x0] = chunk[oy0 - by0:oy1 - by0, ox0 - bx0:ox1 - bx0]
+
+        return out
+
+    def read_all(self) -> np.ndarray:
+        """Reads the whole image."""
+
+        return self.read_region(0, self.shape[0], 0, self.shape[1])
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
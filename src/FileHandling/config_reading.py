@@ -0,0 +1,38 @@
+"""
+General configuration file (config.ini) reading.
+
+* The file is optional: a missing file (or a missing option) means the
+default value of each option.
+"""
+
+# Native Modules:
+import configparser
+from functools import lru_cache
+from pathlib import Path
+
+# Internal Modules:
+from constants import CONFIG_FILE_PATH
+
+
+@lru_cache(maxsize=4)
+def read_config(file_path:str|Path=CONFIG_FILE_PATH) -> configparser.ConfigParser:
+    """
+    Reads (once per path) the INI configuration file.
+
+    Parameters:
+        - file_path: Optional -> Configuration file path.
+
+    Return:
+        The parsed configuration (empty when the file does not exist).
+    """
+
+    config = configparser.ConfigParser()
+    file_path = Path(file_path)
+    if file_path.exists():
+        config.read(file_path, encoding="utf-8")
+    return config
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
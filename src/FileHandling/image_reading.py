@@ -1,12 +1,17 @@
 """
 Image file reading implementation (normal and raw).
+
+* Only numpy is imported at module level, the display helpers are imported
+by `display_image` when it is called.
 """
 
 # Native Modules:
 from pathlib import Path
 
 # Internal Modules:
-import PSE.image_display as ID
+import PSE.pyramid as PY
+import PSE.telemetry as TEL
+import FileHandling.chunked_format as CF
 
 # External Modules:
 import numpy as np
@@ -17,20 +22,32 @@ class RawImageReader:
     RAW image file reader (8 bits, grayscale).
 
     Private_Attributes:
-        - 
+        - `_pyramid`: Cached image pyramid (position 0 is the full image), extended
+        on demand.
+        - `_pyramid_mode`: Pyramid reduction mode ("gaussian" or "mean").
 
     Methods:
         - `dimensions` (@property): Property type method that returns the image
         dimensions as a list, position 0 being width and position 1 being height.
         - `image` (@property): Property type method that returns the image data
         as a numpy.ndarray object.
+        - `source` (@property): Returns the pipeline input (see `PSE.pipeline`).
+        - `level`: Returns a (cached) pyramid level of the image.
+        - `level_for_size`: Returns the first pyramid level that fits in a given size.
 
     Private Methods:
         - `_read_image`: Reads RAW image files and processes it as a NumPy array
         with format (_height, _width) and dtype `uint8`.
     """
 
-    def __init__(self, file_path:str|Path, width:int, height:int) -> None:
+    def __init__(
+        self,
+        file_path:str|Path,
+        width:int,
+        height:int,
+        pyramid_levels:int=0,
+        pyramid_mode:str="gaussian",
+    ) -> None:
         """
         Initializes an instance of RawImageReader class.
 
@@ -38,8 +55,14 @@ class RawImageReader:
             - file_path: A string or a PathLib.Path object to the image file to be read.
             - width: Image width in pixels.
             - height: Image height in pixels.
+            - pyramid_levels: Optional -> Number of reduced levels built right away
+            (levels are otherwise built and cached on first use).
+            - pyramid_mode: Optional -> "gaussian" or "mean" reduction.
         """
 
+        if pyramid_mode not in PY.PYRAMID_MODES:
+            raise ValueError(f"Unknown pyramid mode: {pyramid_mode}")
+
         if int(width) <= 0 or int(height) <= 0:
             raise ValueError("Image width and height must be positive!")
 
@@ -49,6 +72,11 @@ class RawImageReader:
 
         self._raw_image:np.ndarray  = self._read_image(Path(file_path))
 
+        self._pyramid_mode:str          = pyramid_mode
+        self._pyramid:list[np.ndarray]  = [self._raw_image]
+        if pyramid_levels > 0:
+            self.level(pyramid_levels)
+
     @property
     def dimensions(self) -> list[int, int]:
         """
@@ -73,6 +101,51 @@ class RawImageReader:
 
         return self._raw_image
 
+    @property
+    def source(self) -> np.ndarray:
+        """
+        Returns the input to give to `PSE.pipeline.run_pipeline`: the image
+        itself (chunked readers return the file while it is not decoded, so
+        the pipeline decodes it within its memory budget).
+
+        Usage:
+            >>> result = pipeline.run_pipeline(reader.source, block_list)
+        """
+
+        return self.image
+
+    def level(self, level:int) -> np.ndarray:
+        """
+        Returns pyramid level `level` of the image (0 is the full resolution
+        image, each level halves both dimensions). Missing levels are built
+        from the last cached one and kept for later calls.
+
+        Usage:
+            >>> preview:numpy.ndarray = reader.level(2)
+        """
+
+        if level < 0:
+            raise ValueError("Pyramid level must not be negative!")
+
+        TEL.cache_access("pyramid", len(self._pyramid) > level)
+        while len(self._pyramid) <= level:
+            if min(self._pyramid[-1].shape) < 2:
+                break
+            self._pyramid.append(PY.downsample(self._pyramid[-1], self._pyramid_mode))
+
+        return self._pyramid[min(level, len(self._pyramid) - 1)]
+
+    def level_for_size(self, max_width:int, max_height:int) -> int:
+        """
+        Returns the first pyramid level whose dimensions fit in
+        (`max_width`, `max_height`).
+
+        Usage:
+            >>> level:int = reader.level_for_size(320, 240)
+        """
+
+        return PY.level_for_size(self._width, self._height, max_width, max_height)
+
     def _read_image(self, file_path:Path) -> np.ndarray:
         """
         Reads RAW image files and processes it as a NumPy array with format
@@ -89,6 +162,7 @@ class RawImageReader:
             raise FileNotFoundError(f"File not found: {file_path}")
 
         raw_data = file_path.read_bytes()
+        TEL.io_bytes("read", len(raw_data), file_path)
 
         if len(raw_data) != self._expected_size:
             raise ValueError(
@@ -107,7 +181,106 @@ class RawImageReader:
         Displays object image.
         """
 
-        ID.display(self._raw_image)
+        import PSE.image_display as ID
+        ID.display(self.image)
+
+
+class ChunkedImageReader(RawImageReader):
+    """
+    Chunked container image reader (".psec", 8 bits, grayscale).
+
+    Same interface as `RawImageReader`, but the dimensions come from the file
+    header, and single chunks or regions can be read without decoding the rest
+    of the image. The whole image is only decoded on the first access to
+    `image` (or to a pyramid level); until then `source` is the chunked file.
+
+    Methods:
+        - `chunked_file` (@property): Returns the underlying `ChunkedFile`, for
+        chunk and region access.
+    """
+
+    def __init__(self, file_path:str|Path, pyramid_levels:int=0, pyramid_mode:str="gaussian") -> None:
+        """
+        Initializes an instance of ChunkedImageReader class.
+
+        Parameters:
+            - file_path: A string or a PathLib.Path object to the image file to be read.
+            - pyramid_levels: Optional -> See `RawImageReader`.
+            - pyramid_mode: Optional -> See `RawImageReader`.
+        """
+
+        self._file = CF.ChunkedFile(file_path)
+        if self._file.dtype != np.uint8:
+            raise ValueError(f"Only 8 bits images are supported (file dtype: {self._file.dtype}).")
+
+        height, width = self._file.shape
+        super().__init__(file_path, width, height, pyramid_levels, pyramid_mode)
+
+    @property
+    def chunked_file(self) -> CF.ChunkedFile:
+        """
+        Returns the underlying chunked file (chunk/region access).
+
+        Usage:
+            >>> tile:numpy.ndarray = reader.chunked_file.read_region(0, 64, 0, 64)
+        """
+
+        return self._file
+
+    @property
+    def image(self) -> np.ndarray:
+        if self._raw_image is None:
+            self._raw_image = self._pyramid[0] = self._decode()
+        return self._raw_image
+
+    @property
+    def source(self) -> np.ndarray|CF.ChunkedFile:
+        return self._file if self._raw_image is None else self._raw_image
+
+    def level(self, level:int) -> np.ndarray:
+        self.image      # decodifica o nível 0 antes de reduzir
+        return super().level(level)
+
+    def _read_image(self, file_path:Path) -> None:
+        """
+        Defers decoding to the first use of `image` (see `_decode`).
+        """
+
+        return None
+
+    def _decode(self) -> np.ndarray:
+        """
+        Decodes every chunk of the file into a (_height, _width) `uint8` array.
+        """
+
+        # os bytes lidos de cada bloco são registrados pelo `ChunkedFile`
+        return self._file.read_all()
+
+
+def open_image(
+    file_path:str|Path,
+    width:int|None=None,
+    height:int|None=None,
+    **kwargs,
+) -> RawImageReader:
+    """
+    Opens an input image by extension: ".psec" files are read with
+    `ChunkedImageReader` (dimensions from the header, `width`/`height`
+    ignored), anything else as a headerless RAW file with `RawImageReader`.
+
+    Parameters:
+        - file_path: A string or a PathLib.Path object to the image file to be read.
+        - width: Image width in pixels (RAW files).
+        - height: Image height in pixels (RAW files).
+        - kwargs: Extra reader arguments (`pyramid_levels`, `pyramid_mode`).
+    """
+
+    if Path(file_path).suffix.lower() == CF.FILE_EXTENSION:
+        return ChunkedImageReader(file_path, **kwargs)
+
+    if width is None or height is None:
+        raise ValueError("RAW files need the image width and height!")
+    return RawImageReader(file_path, width, height, **kwargs)
 
 
 
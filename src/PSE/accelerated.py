@@ -0,0 +1,156 @@
+"""
+Optional compiled (numba) kernels for neighborhood blocks.
+
+* numba is optional. It is only imported the first time the registry checks
+whether this backend is available (first floating point convolution; the
+backend only declares the "float" capability), never at import time,
+so the startup budget is unaffected. Without numba, or when compilation fails,
+the registry keeps using the numpy implementation.
+* The kernels are compiled eagerly for explicit signatures with `cache=True`:
+the machine code is stored on disk (`__pycache__`) and later processes load it
+instead of compiling. Each process still pays the numba import and the cache
+load (a few hundred ms) on the first availability check; long-lived runners
+(pipeline server, streaming) do it at start through `REG.warm_up`.
+* Only the floating point paths of the convolution are compiled; they follow
+the same execution plan (`PSE.convolution.plan`) and the same operation order
+as the numpy code (row-major over the nonzero weights, float64 accumulation,
+float32 rounding, clip, truncation), so both backends give identical results.
+Integer and fixed-point masks keep the vectorized numpy int16/int32 path,
+which is faster than a scalar compiled loop. The kernels release the GIL (`nogil`), so streaming
+workers run them in parallel.
+"""
+
+# Native Modules:
+import threading
+
+# Internal Modules:
+import PSE.convolution as CV
+import PSE.registry as REG
+from PSE.kernels import Kernel
+
+# External Modules:
+import numpy as np
+
+
+_compiled:dict|None = None      # Kernel name -> compiled function, filled by `available`.
+_compile_lock = threading.Lock()
+
+
+def _correlate_float(padded, weights):
+    kh, kw = weights.shape
+    h = padded.shape[0] - 2 * (kh // 2)     # padding de k // 2 (máscaras pares também)
+    w = padded.shape[1] - 2 * (kw // 2)
+    out = np.empty((h, w), dtype=np.uint8)
+    for i in range(h):
+        for j in range(w):
+            acc = 0.0
+            for a in range(kh):
+                for b in range(kw):
+                    weight = weights[a, b]
+                    if weight != 0:
+                        acc += weight * np.float64(padded[i + a, j + b])
+            # mesmo arredondamento do numpy: float64 -> float32, clip e truncamento
+            value = np.float32(acc)
+            out[i, j] = 0 if value < 0 else (255 if value > 255 else np.int64(value))
+    return out
+
+
+def _correlate_float_separable(padded, col, row):
+    k = col.shape[0]
+    h = padded.shape[0] - 2 * (k // 2)
+    w = padded.shape[1] - 2 * (k // 2)
+    rows = np.zeros((padded.shape[0], w), dtype=np.float64)
+    for y in range(padded.shape[0]):
+        for j in range(w):
+            acc = 0.0
+            for b in range(k):
+                if row[b] != 0:
+                    acc += row[b] * np.float64(padded[y, j + b])
+            rows[y, j] = acc
+
+    out = np.empty((h, w), dtype=np.uint8)
+    for i in range(h):
+        for j in range(w):
+            acc = 0.0
+            for a in range(k):
+                if col[a] != 0:
+                    acc += col[a] * rows[i + a, j]
+            # mesmo arredondamento do numpy: float64 -> float32, clip e truncamento
+            value = np.float32(acc)
+            out[i, j] = 0 if value < 0 else (255 if value > 255 else np.int64(value))
+    return out
+
+
+# Kernel name -> (python function, numba signature).
+_SIGNATURES:dict[str, tuple] = {
+    "float": (_correlate_float, "uint8[:, ::1](uint8[:, ::1], float64[:, ::1])"),
+    "float_separable": (_correlate_float_separable, "uint8[:, ::1](uint8[:, ::1], float64[::1], float64[::1])"),
+}
+
+
+def _compile() -> dict:
+    """Compiles (or loads from the on-disk cache) every kernel."""
+
+    import numba
+
+    def jit(function, signature:str):
+        try:
+            return numba.njit(signature, cache=True, nogil=True)(function)
+        except RuntimeError:
+            # sem diretório gravável para o cache: compila só em memória
+            return numba.njit(signature, nogil=True)(function)
+
+    return {name: jit(function, signature) for name, (function, signature) in _SIGNATURES.items()}
+
+
+def available() -> bool:
+    """
+    Whether the compiled backend can be used (numba installed and kernels
+    compiled). The first call compiles or loads the cached kernels.
+    """
+
+    global _compiled
+    with _compile_lock:
+        if _compiled is None:
+            try:
+                _compiled = _compile()
+            except Exception:
+                _compiled = {}
+    return bool(_compiled)
+
+
+def correlate(image:np.ndarray, kernel:Kernel) -> np.ndarray:
+    """
+    Compiled version of `PSE.convolution.correlate` (same arguments, identical
+    result). Non uint8 images are delegated to the numpy implementation.
+    """
+
+    path = CV.select_path(kernel)
+    if path.startswith("integer") or image.dtype != np.uint8 or not available():
+        # os caminhos inteiros vetorizados (int16/int32) do numpy já são mais
+        # rápidos que um laço escalar compilado
+        return CV.correlate(image, kernel)
+
+    pad = kernel.size // 2
+    padded = np.ascontiguousarray(np.pad(image, pad_width=pad, mode="constant", constant_values=0))
+
+    # os pesos do `Kernel` são somente leitura; as assinaturas compiladas
+    # usam arrays graváveis, então cada chamada passa uma cópia (k ou k² valores)
+    if path == "separable":
+        return _compiled["float_separable"](padded, np.array(kernel.col), np.array(kernel.row))
+    return _compiled["float"](padded, np.array(kernel.values))
+
+
+# só o caminho em ponto flutuante é compilado: kernels inteiros e de ponto
+# fixo selecionam o numpy sem importar o numba
+REG.register_implementation(
+    "correlate", "numba", correlate,
+    priority=10,
+    available=available,
+    capabilities=("float", "compiled"),
+)
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
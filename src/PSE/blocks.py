@@ -1,32 +1,108 @@
-"""Block class defition file for PSE_GUI."""
+"""
+Block class defition file for PSE_GUI.
+
+* Only numpy is imported here: tkinter is needed just for type hints and the
+plotting backend is loaded by PSE.image_display on first use.
+"""
 
 # Native Modules:
-import tkinter as tk
+from __future__ import annotations
+import copy
+from typing import TYPE_CHECKING
 
 # Internal Modules:
 import PSE.image_display as ID
+import PSE.frequency as FQ
+import PSE.components as CC
+import PSE.kernels as KN
+import PSE.convolution as CV
+import PSE.accelerated  # registra a implementação compilada opcional (numba)
+import PSE.registry as REG
+import PSE.telemetry as TEL
+from PSE.registry import ConstVar, ParamSpec, BlockSpec
 import FileHandling.image_reading as IR
+import FileHandling.chunked_format as CF
 
 # External Modules:
 import numpy as np
 from pathlib import Path
-import matplotlib.pyplot as mpl
+
+if TYPE_CHECKING:
+    import tkinter as tk
 
 
 class Block:
     """
     Main parent class: every inherited child class will input and output an image.
 
+    Attributes:
+        - `is_sink`: True for blocks that consume the image (display, saving, plots)
+        and return it unchanged; lazy pipelines only evaluate what feeds a sink.
+        - `produces_report`: True for blocks whose `report` is a result of the
+        flow (e.g. region tables); lazy pipelines evaluate them like sinks.
+        - `spec` / `variables`: Registry definition and parameter variables of
+        blocks created through `PSE.registry` (`None` otherwise).
+
     Methods:
         - `apply`: Raises `NotImplementedError` if the inherited class does not implement its own apply method.
+        - `for_level`: Returns the block to run on a reduced pyramid level (previews).
+        - `report`: Returns the structured results of the last `apply` (or `None`).
+        - `estimate_memory`: Estimated peak memory of `apply` for an image shape.
+        - `tile_halo`: Context rows needed to run the block on strips (or `None`).
     
     """
 
+    is_sink:bool = False
+    produces_report:bool = False
+    spec:REG.BlockSpec|None = None
+    variables:dict|None = None
+    _report:dict|None = None
+
     def apply(self, image:np.ndarray) -> np.ndarray:
         """Applies the transformation to the image."""
 
         raise NotImplementedError
 
+    def report(self) -> dict|None:
+        """
+        Returns the structured results of the last `apply` call (measurements,
+        statistics...), collected by the pipeline into its run report. Blocks
+        that only transform the image return `None`.
+        """
+
+        return self._report
+
+    def for_level(self, level:int) -> Block|None:
+        """
+        Returns the block to run on pyramid level `level` (each level halves the
+        resolution): `self` when the parameters do not depend on the resolution,
+        an adjusted copy when they do, or `None` when the block must not run on
+        a reduced image.
+        """
+
+        return self
+
+    def estimate_memory(self, shape:tuple[int, int]) -> int:
+        """
+        Estimated peak bytes of the temporaries and output of `apply` on an
+        uint8 image of `shape` (the input itself not included), used by the
+        executor to enforce the memory budget. The default assumes a few
+        full-size byte arrays.
+        """
+
+        return 4 * shape[0] * shape[1]
+
+    def tile_halo(self, shape:tuple[int, int]) -> int|None:
+        """
+        Rows of context needed above and below a strip of rows so that the
+        block computes it exactly as on the whole image (0 for pixel-wise
+        blocks), or `None` when the block must see the whole image (global
+        statistics, FFT, sinks). Tileable blocks can run in strips when the
+        image does not fit in the memory budget.
+        """
+
+        return None
+
 
 class DisplayBlock(Block):
     """
@@ -36,6 +112,8 @@ class DisplayBlock(Block):
     devolve a mesma imagem (não altera o pipeline).
     """
 
+    is_sink = True
+
     def __init__(self, title_var: tk.StringVar | None = None) -> None:
         self._title_var = title_var
 
@@ -53,6 +131,8 @@ class SaveRawBlock(Block):
     sem cabeçalho. Não altera a imagem do pipeline.
     """
 
+    is_sink = True
+
     def __init__(self, path_var: tk.StringVar) -> None:
         self._path_var = path_var
 
@@ -66,9 +146,58 @@ class SaveRawBlock(Block):
 
         arr = np.clip(image, 0, 255).astype(np.uint8)
         file_path.write_bytes(arr.tobytes())
+        TEL.io_bytes("write", arr.nbytes, file_path)
 
         return image
 
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        # clip + astype + tobytes
+        return 3 * shape[0] * shape[1]
+
+    def for_level(self, level: int) -> Block | None:
+        # só grava em resolução completa (prévias não sobrescrevem arquivos)
+        return self if level == 0 else None
+
+
+class SaveChunkedBlock(Block):
+    """
+    Bloco de gravação no formato em blocos (.psec).
+
+    Salva a imagem atual dividida em blocos (chunks) com cabeçalho
+    (dimensões, tipo, grade de blocos) e compressão zlib opcional por bloco.
+    Não altera a imagem do pipeline.
+    """
+
+    is_sink = True
+
+    COMPRESSIONS: tuple[str, ...] = tuple(CF.CODECS)
+
+    def __init__(self, path_var: tk.StringVar, compression_var: tk.StringVar) -> None:
+        self._path_var = path_var
+        self._compression_var = compression_var
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        path_str = self._path_var.get()
+        if not path_str:
+            raise ValueError("Nenhum arquivo de saída definido no bloco de gravação em blocos.")
+
+        compression = self._compression_var.get()
+        if compression not in self.COMPRESSIONS:
+            raise ValueError(f"Compressão desconhecida: {compression}")
+
+        arr = np.clip(image, 0, 255).astype(np.uint8)
+        written = CF.write_chunked(path_str, arr, compression=compression)
+        TEL.io_bytes("write", written, path_str)
+
+        return image
+
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        # clip + astype + blocos (comprimidos ou não) acumulados antes da escrita
+        return 4 * shape[0] * shape[1]
+
+    def for_level(self, level: int) -> Block | None:
+        return self if level == 0 else None
+
 
 class BrightnessBlock(Block):
     def __init__(self, delta_var: tk.StringVar):
@@ -85,6 +214,13 @@ class BrightnessBlock(Block):
         tmp = np.clip(tmp, 0, 255)
         return tmp.astype(np.uint8)
 
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        # int16 + clip int16 + saída uint8
+        return 5 * shape[0] * shape[1]
+
+    def tile_halo(self, shape: tuple[int, int]) -> int | None:
+        return 0
+
 
 class ThresholdBlock(Block):
     def __init__(self, threshold_var: tk.StringVar):
@@ -101,28 +237,248 @@ class ThresholdBlock(Block):
         result[image >= t] = 255
         return result
 
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        return 2 * shape[0] * shape[1]
+
+    def tile_halo(self, shape: tuple[int, int]) -> int | None:
+        return 0
+
+
+def _otsu_threshold(image: np.ndarray) -> int:
+    """
+    Calcula o limiar de Otsu a partir do histograma uint8 (np.bincount).
+
+    Return:
+        O limiar `t` que maximiza a variância entre classes; os pixels
+        com valor > t pertencem ao primeiro plano.
+    """
+
+    hist = np.bincount(image.ravel(), minlength=256).astype(np.float64)
+    total = hist.sum()
+    if total == 0:
+        return 128
+
+    prob = hist / total
+    omega = np.cumsum(prob)                      # peso da classe de fundo
+    mu = np.cumsum(prob * np.arange(256))        # média acumulada
+    mu_t = mu[-1]
+
+    denom = omega * (1.0 - omega)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma_b = np.where(denom > 0, (mu_t * omega - mu) ** 2 / denom, 0.0)
+
+    return int(np.argmax(sigma_b))
+
+
+def _local_mean_std(image: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Média e desvio padrão locais (janela `window` x `window`) via imagens integrais.
+
+    As somas de x e x² são acumuladas uma única vez; cada janela custa só
+    4 consultas, então o custo não depende do tamanho da janela. Nas bordas
+    a janela é recortada e a média usa apenas os pixels válidos.
+    """
+
+    h, w = image.shape
+    r = window // 2
+
+    x = image.astype(np.int64)
+    s1 = np.zeros((h + 1, w + 1), dtype=np.int64)
+    s2 = np.zeros((h + 1, w + 1), dtype=np.int64)
+    s1[1:, 1:] = x.cumsum(axis=0).cumsum(axis=1)
+    s2[1:, 1:] = (x * x).cumsum(axis=0).cumsum(axis=1)
+
+    y0 = np.clip(np.arange(h) - r, 0, h)
+    y1 = np.clip(np.arange(h) + r + 1, 0, h)
+    x0 = np.clip(np.arange(w) - r, 0, w)
+    x1 = np.clip(np.arange(w) + r + 1, 0, w)
+
+    def window_sum(s: np.ndarray) -> np.ndarray:
+        return (
+            s[np.ix_(y1, x1)] - s[np.ix_(y0, x1)]
+            - s[np.ix_(y1, x0)] + s[np.ix_(y0, x0)]
+        )
+
+    count = ((y1 - y0)[:, None] * (x1 - x0)[None, :]).astype(np.float64)
+    mean = window_sum(s1) / count
+    var = window_sum(s2) / count - mean * mean
+    std = np.sqrt(np.maximum(var, 0.0))
+
+    return mean, std
+
+
+class AdaptiveThresholdBlock(Block):
+    """
+    Bloco de limiarização adaptativa (local ou automática).
+
+    Modos:
+    - "Média local": T = média da janela - C
+    - "Niblack":     T = média + k * desvio
+    - "Sauvola":     T = média * (1 + k * (desvio / 128 - 1))
+    - "Otsu":        T global calculado do histograma (ignora janela, k e C)
+
+    Com k em branco, vale o padrão do modo (`DEFAULT_K`): -0.2 no Niblack
+    e 0.5 no Sauvola.
+
+    Pixels com valor > T viram 255, os demais 0. As estatísticas locais
+    são calculadas em uma única passada (imagens integrais), sem convolução
+    nem leitura de outra imagem RAW.
+    """
+
+    MODES: tuple[str, ...] = ("Média local", "Niblack", "Sauvola", "Otsu")
+    DEFAULT_K: dict[str, float] = {"Niblack": -0.2, "Sauvola": 0.5}
+
+    def __init__(
+        self,
+        mode_var: tk.StringVar,
+        window_var: tk.StringVar,
+        k_var: tk.StringVar,
+        offset_var: tk.StringVar,
+    ) -> None:
+        self._mode_var = mode_var
+        self._window_var = window_var
+        self._k_var = k_var
+        self._offset_var = offset_var
+
+    def _get_params(self) -> tuple[str, int, float, float]:
+        mode = self._mode_var.get()
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de limiarização desconhecido: {mode}")
+
+        try:
+            window = int(self._window_var.get())
+        except ValueError:
+            window = 15
+        window = max(3, window)
+        if window % 2 == 0:
+            window += 1
+
+        try:
+            k = float(self._k_var.get())
+        except ValueError:
+            k = self.DEFAULT_K.get(mode, 0.0)
+
+        try:
+            offset = float(self._offset_var.get())
+        except ValueError:
+            offset = 0.0
+
+        return mode, window, k, offset
+
+    def for_level(self, level: int) -> Block | None:
+        if level == 0:
+            return self
+
+        # a janela cobre a mesma área da imagem em cada nível
+        _, window, _, _ = self._get_params()
+        scaled = copy.copy(self)
+        scaled._window_var = ConstVar(max(3, window >> level))
+        return scaled
+
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        if self._get_params()[0] == "Otsu":
+            return 2 * shape[0] * shape[1]
+        # imagens integrais int64 (x, x², somas acumuladas, consultas) e
+        # estatísticas float64 (média, variância, desvio, limiar)
+        return 112 * shape[0] * shape[1]
+
+    def tile_halo(self, shape: tuple[int, int]) -> int | None:
+        mode, window, _, _ = self._get_params()
+        # Otsu usa o histograma global; nos outros modos basta meia janela
+        return None if mode == "Otsu" else window // 2
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        mode, window, k, offset = self._get_params()
+
+        if mode == "Otsu":
+            t = _otsu_threshold(image)
+            result = np.zeros_like(image, dtype=np.uint8)
+            result[image > t] = 255
+            return result
+
+        mean, std = _local_mean_std(image, window)
+
+        if mode == "Média local":
+            t = mean - offset
+        elif mode == "Niblack":
+            t = mean + k * std
+        else:
+            t = mean * (1.0 + k * (std / 128.0 - 1.0))
+
+        result = np.zeros_like(image, dtype=np.uint8)
+        result[image > t] = 255
+        return result
+
+
+class ConnectedComponentsBlock(Block):
+    """
+    Bloco de rotulação de componentes conexos (imagem binarizada).
+
+    - Pixels diferentes de zero são primeiro plano (use após a limiarização).
+    - Conectividade 4 ou 8.
+    - A saída do pipeline é o mapa de rótulos em tons de cinza distintos;
+      o relatório do bloco (`report`) traz o número de regiões, a tabela
+      de regiões (rótulo, área, caixa envolvente, centróide) e a imagem
+      de rótulos int32.
+    """
+
+    CONNECTIVITIES: tuple[str, ...] = ("8", "4")
+    produces_report = True
+
+    def __init__(self, connectivity_var: tk.StringVar) -> None:
+        self._connectivity_var = connectivity_var
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        connectivity = self._connectivity_var.get()
+        if connectivity not in self.CONNECTIVITIES:
+            raise ValueError(f"Conectividade inválida: {connectivity} (use 4 ou 8)")
+
+        labels, regions = CC.label_components(image, int(connectivity))
+        self._report = {
+            "connectivity": int(connectivity),
+            "count": len(regions),
+            "regions": regions,
+            "labels": labels,
+        }
+
+        # 67 é primo com 255: rótulos vizinhos ganham tons bem diferentes
+        out = np.zeros(image.shape, dtype=np.uint8)
+        mask = labels > 0
+        out[mask] = ((labels[mask] - 1) * 67 % 255 + 1).astype(np.uint8)
+        return out
+
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        # rótulos int32, bordas int8 e, no pior caso (xadrez), uma corrida a
+        # cada 2 pixels com vários vetores int64 por corrida
+        return 48 * shape[0] * shape[1]
+
 
 class HistogramBlock(Block):
+    is_sink = True
+
     def apply(self, image: np.ndarray) -> np.ndarray:
         """
         Mostra o histograma da imagem, mas não altera a imagem.
         """
         hist, _ = np.histogram(image.flatten(), bins=256, range=(0, 255))
-        mpl.figure()
-        mpl.bar(range(256), hist)
-        mpl.title("Histograma")
-        mpl.xlabel("Intensidade")
-        mpl.ylabel("Frequência")
-        mpl.show()
+        ID.histogram(hist)
         return image
 
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        return 2 * shape[0] * shape[1]
+
 
 class ConvolutionBlock(Block):
     """
     Bloco de convolução local.
 
     - O tamanho do kernel é inferido de `entries_matrix` (n x n).
-    - Os pesos são lidos das entradas de texto.
+    - Os pesos são lidos das entradas de texto e viram um `Kernel` imutável,
+      analisado uma vez (soma, inteiro, simétrico, separável).
+    - Nas prévias (níveis reduzidos da pirâmide), máscaras pré-definidas
+      (Média, Laplacianos) são reduzidas para cobrir a mesma área da imagem;
+      máscaras personalizadas são aplicadas como estão, então a prévia de
+      uma convolução personalizada não equivale ao resultado final.
     """
 
     def __init__(self, size_var, entries_matrix) -> None:
@@ -135,51 +491,194 @@ class ConvolutionBlock(Block):
         """Atualiza a referência da matriz de entradas (quando a GUI recria o grid)."""
         self._entries_matrix = entries_matrix
 
-    def _get_kernel(self) -> np.ndarray:
+    def _get_kernel(self) -> KN.Kernel:
+        """
+        Lê as células da máscara e devolve o `Kernel` correspondente (em cache
+        pelo conteúdo: só é reconstruído/analisado quando alguma célula muda).
+        Células inválidas geram `ValueError` indicando a posição.
+        """
+
         if not self._entries_matrix:
-            raise RuntimeError("Kernel não definido: matriz de entradas vazia.")
+            raise ValueError("Kernel não definido: matriz de entradas vazia.")
+
+        cells = tuple(tuple(e.get() for e in row) for row in self._entries_matrix)
+        return KN.parse_kernel(cells)
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        # implementação registrada mais rápida disponível com a capacidade
+        # exigida pelo plano do kernel (inteiro, ponto fixo ou ponto flutuante)
+        kernel = self._get_kernel()
+        correlate = REG.select_implementation("correlate", require=(CV.capability(kernel),)).function
+        return correlate(image, kernel)
+
+    def for_level(self, level: int) -> Block | None:
+        if level == 0:
+            return self
+
+        kernel = self._get_kernel()
+        preset = KN.match_preset(kernel)
+        if preset is None:
+            return self
 
-        n = len(self._entries_matrix)
-        values: list[float] = []
+        # mesma área da imagem em cada nível, mantendo a paridade do tamanho
+        minimum = 1 if preset == "Média" else 3
+        size = max(minimum, kernel.size >> level) | (kernel.size & 1)
+        values = KN.preset_kernel(preset, size).values
 
-        for row in self._entries_matrix:
-            # garante que é uma linha com n colunas
-            if len(row) != n:
-                raise RuntimeError("Matriz de entradas não é quadrada.")
-            for e in row:
-                try:
-                    values.append(float(e.get()))
-                except Exception:
-                    values.append(0.0)
+        scaled = copy.copy(self)
+        scaled._entries_matrix = [[ConstVar(KN.format_weight(w)) for w in row] for row in values]
+        return scaled
 
-        kernel = np.asarray(values, dtype=float).reshape((n, n))
-        return kernel
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        return CV.estimate_memory(shape, self._get_kernel())
+
+    def tile_halo(self, shape: tuple[int, int]) -> int | None:
+        # padding com zeros: só as bordas reais da imagem veem zeros
+        return self._get_kernel().size // 2
+
+
+class FFTConvolutionBlock(ConvolutionBlock):
+    """
+    Bloco de convolução local calculada no domínio da frequência.
+
+    Mesma máscara e mesmo resultado do `ConvolutionBlock` (padding com zeros),
+    mas o custo não cresce com o tamanho da máscara: indicado para máscaras
+    grandes.
+    """
 
     def apply(self, image: np.ndarray) -> np.ndarray:
         kernel = self._get_kernel()
-        k = kernel.shape[0]
-        pad = k // 2
-
-        # padding com zeros
-        padded = np.pad(
-            image.astype(np.float32),
-            pad_width=pad,
-            mode="constant",
-            constant_values=0,
-        )
+        out = FQ.fft_correlate(image, kernel.values)
+
+        # a FFT devolve inteiros como x.9999999..., a tolerância evita
+        # que o truncamento para uint8 perca 1 nível em relação ao espacial
+        out = np.clip(out + 1e-6, 0, 255)
+        return out.astype(np.uint8)
+
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        k = self._get_kernel().size
+        padded_shape = FQ.optimal_fft_shape((shape[0] + k - 1, shape[1] + k - 1))
+        return FQ.estimate_memory(shape, padded_shape)
+
+    def tile_halo(self, shape: tuple[int, int]) -> int | None:
+        # resultado depende do arredondamento da FFT da imagem inteira
+        return None
 
-        h, w = image.shape
-        out = np.zeros((h, w), dtype=np.float32)
 
-        # convolução "na mão"
-        for i in range(h):
-            for j in range(w):
-                region = padded[i:i + k, j:j + k]
-                out[i, j] = np.sum(region * kernel)
+class FrequencyFilterBlock(Block):
+    """
+    Bloco de filtragem no domínio da frequência (passa-baixa / passa-alta).
+
+    - Formatos: Ideal, Gaussiano ou Butterworth (com ordem).
+    - O corte é dado como fração da frequência de Nyquist (0 < corte <= 1).
+    - A imagem é estendida por reflexão até um tamanho ótimo para a FFT.
+    """
+
+    TYPES: tuple[str, ...] = ("Passa-baixa", "Passa-alta")
+    SHAPES: tuple[str, ...] = ("Ideal", "Gaussiano", "Butterworth")
+
+    def __init__(
+        self,
+        type_var: tk.StringVar,
+        shape_var: tk.StringVar,
+        cutoff_var: tk.StringVar,
+        order_var: tk.StringVar,
+    ) -> None:
+        self._type_var = type_var
+        self._shape_var = shape_var
+        self._cutoff_var = cutoff_var
+        self._order_var = order_var
+
+    def _get_cutoff(self) -> float:
+        """Corte como fração de Nyquist, limitado a (0, 1]."""
+
+        try:
+            cutoff = float(self._cutoff_var.get())
+        except ValueError:
+            cutoff = 0.25
+        return max(1e-3, min(1.0, cutoff))
 
+    def for_level(self, level: int) -> Block | None:
+        if level == 0:
+            return self
+
+        # mesma frequência física: em relação a Nyquist, dobra a cada nível
+        scaled = copy.copy(self)
+        scaled._cutoff_var = ConstVar(min(1.0, self._get_cutoff() * (2 ** level)))
+        return scaled
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        filter_type = self._type_var.get()
+        if filter_type not in self.TYPES:
+            raise ValueError(f"Tipo de filtro desconhecido: {filter_type}")
+
+        cutoff = self._get_cutoff() * 0.5   # fração de Nyquist -> ciclos/pixel
+
+        try:
+            order = int(self._order_var.get())
+        except ValueError:
+            order = 2
+        order = max(1, order)
+
+        padded_shape = FQ.optimal_fft_shape(image.shape)
+        transfer = FQ.lowpass_transfer(padded_shape, self._shape_var.get(), cutoff, order)
+        if filter_type == "Passa-alta":
+            transfer = 1.0 - transfer
+
+        out = FQ.filter_image(image, transfer, padded_shape)
         out = np.clip(out, 0, 255)
         return out.astype(np.uint8)
 
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        return FQ.estimate_memory(shape, FQ.optimal_fft_shape(shape))
+
+
+class NotchFilterBlock(Block):
+    """
+    Bloco de remoção de ruído periódico (filtro notch gaussiano).
+
+    - Frequências no formato "u,v; u,v" em ciclos por imagem
+      (u vertical, v horizontal); o ponto simétrico (-u,-v) é incluído.
+    - Raio do notch também em ciclos por imagem.
+    """
+
+    def __init__(self, points_var: tk.StringVar, radius_var: tk.StringVar) -> None:
+        self._points_var = points_var
+        self._radius_var = radius_var
+
+    def _get_points(self) -> tuple[tuple[int, int], ...]:
+        points: list[tuple[int, int]] = []
+        for item in self._points_var.get().split(";"):
+            if not item.strip():
+                continue
+            try:
+                u, v = (int(x) for x in item.split(","))
+            except ValueError:
+                raise ValueError(f"Frequência inválida no bloco notch: '{item.strip()}' (use u,v)")
+            points.append((u, v))
+        return tuple(points)
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        points = self._get_points()
+        if not points:
+            return image
+
+        try:
+            radius = float(self._radius_var.get())
+        except ValueError:
+            radius = 3.0
+        radius = max(0.5, radius)
+
+        padded_shape = FQ.optimal_fft_shape(image.shape)
+        transfer = FQ.notch_transfer(padded_shape, image.shape, points, radius)
+
+        out = FQ.filter_image(image, transfer, padded_shape)
+        out = np.clip(out, 0, 255)
+        return out.astype(np.uint8)
+
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        return FQ.estimate_memory(shape, FQ.optimal_fft_shape(shape))
+
 
 class DifferenceBlock(Block):
     """
@@ -187,8 +686,12 @@ class DifferenceBlock(Block):
     e uma outra imagem RAW escolhida pelo usuário.
 
     A outra imagem é definida por:
-    - caminho do arquivo RAW
-    - largura e altura informadas no próprio bloco
+    - caminho do arquivo RAW (ou .psec)
+    - largura e altura informadas no próprio bloco (ignoradas para .psec)
+
+    A imagem de referência fica em cache enquanto caminho, dimensões e data
+    de modificação do arquivo não mudarem. Em prévias (nível de pirâmide > 0)
+    a referência é reduzida ao mesmo nível.
     """
 
     def __init__(
@@ -200,6 +703,17 @@ class DifferenceBlock(Block):
         self._path_var = path_var
         self._width_var = width_var
         self._height_var = height_var
+        self._level = 0
+        # nível -> (chave do arquivo, imagem); compartilhado com as cópias de for_level
+        self._cache: dict[int, tuple[tuple, np.ndarray]] = {}
+
+    def for_level(self, level: int) -> Block | None:
+        if level == 0:
+            return self
+
+        scaled = copy.copy(self)
+        scaled._level = level
+        return scaled
 
     def apply(self, image: np.ndarray) -> np.ndarray:
         # pega dados da interface
@@ -207,20 +721,28 @@ class DifferenceBlock(Block):
         if not path_str:
             raise ValueError("Nenhum arquivo RAW selecionado no bloco de diferença.")
 
-        try:
-            w = int(self._width_var.get())
-            h = int(self._height_var.get())
-        except ValueError:
-            raise ValueError("Largura e/ou altura inválidas no bloco de diferença.")
-
-        if w <= 0 or h <= 0:
-            raise ValueError("Largura e altura devem ser positivas no bloco de diferença.")
-
         path = Path(path_str)
 
-        # lê a segunda imagem RAW
-        reader = IR.RawImageReader(path, w, h)
-        other = reader.image
+        if path.suffix.lower() == CF.FILE_EXTENSION:
+            w = h = None    # dimensões vêm do cabeçalho do arquivo
+        else:
+            try:
+                w = int(self._width_var.get())
+                h = int(self._height_var.get())
+            except ValueError:
+                raise ValueError("Largura e/ou altura inválidas no bloco de diferença.")
+
+            if w <= 0 or h <= 0:
+                raise ValueError("Largura e altura devem ser positivas no bloco de diferença.")
+
+        # lê a segunda imagem RAW (ou reaproveita a leitura anterior)
+        key = (str(path), w, h, path.stat().st_mtime_ns if path.exists() else None)
+        cached = self._cache.get(self._level)
+        if cached is None or cached[0] != key:
+            reader = IR.open_image(path, w, h)
+            cached = (key, reader.level(self._level))
+            self._cache[self._level] = cached
+        other = cached[1]
 
         # checa se tem o mesmo tamanho da imagem atual do pipeline
         if other.shape != image.shape:
@@ -235,4 +757,118 @@ class DifferenceBlock(Block):
         diff = np.abs(a - b)
         diff = np.clip(diff, 0, 255).astype(np.uint8)
 
-        return diff
\ No newline at end of file
+        return diff
+
+    def estimate_memory(self, shape: tuple[int, int]) -> int:
+        # referência uint8 + 2 cópias int16 + diferença int16 + clip + saída
+        return 10 * shape[0] * shape[1]
+
+
+#------------------------------ Registro ------------------------------
+# Uma definição por bloco: a GUI, o formato JSON de fluxo (servidor,
+# streaming, execução sem interface) e os arquivos de fluxo salvos são
+# gerados a partir dela. A ordem de registro é a ordem dos botões.
+_RAW_FILETYPES = (("RAW files", "*.raw"), ("Todos os arquivos", "*.*"))
+_PSEC_FILETYPES = (("Imagens em blocos", "*.psec"), ("Todos os arquivos", "*.*"))
+_INPUT_FILETYPES = (("RAW files", "*.raw"), ("Imagens em blocos", "*.psec"), ("Todos os arquivos", "*.*"))
+
+REG.register_block(BlockSpec(
+    "display", "Exibir imagem",
+    lambda title: DisplayBlock(title),
+    (ParamSpec("title", kind="text", default="Imagem após bloco {index}", width=30),),
+    button="Exibir Imagem",
+    headless=False,
+))
+REG.register_block(BlockSpec(
+    "save_raw", "Gravar imagem RAW",
+    lambda path: SaveRawBlock(path),
+    (ParamSpec("path", kind="save_path", width=30, filetypes=_RAW_FILETYPES, extension=".raw"),),
+    button="Salvar .RAW",
+))
+REG.register_block(BlockSpec(
+    "save_chunked", "Gravar imagem em blocos (.psec)",
+    lambda path, compression: SaveChunkedBlock(path, compression),
+    (
+        ParamSpec("path", kind="save_path", width=30, filetypes=_PSEC_FILETYPES, extension=CF.FILE_EXTENSION),
+        ParamSpec("compression", "Compressão", "choice", "zlib", SaveChunkedBlock.COMPRESSIONS),
+    ),
+    button="Salvar .PSEC",
+))
+REG.register_block(BlockSpec(
+    "brightness", "Brilho",
+    lambda delta: BrightnessBlock(delta),
+    (ParamSpec("delta", "Δ", "int", 0),),
+    button="Adicionar brilho",
+))
+REG.register_block(BlockSpec(
+    "threshold", "Limiarização",
+    lambda t: ThresholdBlock(t),
+    (ParamSpec("t", "Limiar T", "int", 128),),
+    button="Adicionar limiarização",
+))
+REG.register_block(BlockSpec(
+    "adaptive_threshold", "Limiar adaptativo",
+    lambda mode, window, k, offset: AdaptiveThresholdBlock(mode, window, k, offset),
+    (
+        ParamSpec("mode", kind="choice", default=AdaptiveThresholdBlock.MODES[0], choices=AdaptiveThresholdBlock.MODES),
+        ParamSpec("window", "Janela", "int", 15, width=4),
+        ParamSpec("k", "k", "float", "", width=5),     # em branco: padrão do modo
+        ParamSpec("offset", "C", "float", 5, width=5),
+    ),
+    button="Adicionar limiarização adaptativa",
+))
+REG.register_block(BlockSpec(
+    "convolution", "Convolução local",
+    lambda kernel: ConvolutionBlock(None, kernel),
+    (ParamSpec("kernel", "Máscara", "kernel", max_size=9),),
+    button="Adicionar convolução 3x3",
+))
+REG.register_block(BlockSpec(
+    "fft_convolution", "Convolução local (FFT)",
+    lambda kernel: FFTConvolutionBlock(None, kernel),
+    (ParamSpec("kernel", "Máscara", "kernel", max_size=31),),
+    button="Adicionar convolução (FFT)",
+))
+REG.register_block(BlockSpec(
+    "frequency_filter", "Filtro de frequência",
+    lambda type, shape, cutoff, order: FrequencyFilterBlock(type, shape, cutoff, order),
+    (
+        ParamSpec("type", kind="choice", default=FrequencyFilterBlock.TYPES[0], choices=FrequencyFilterBlock.TYPES),
+        ParamSpec("shape", kind="choice", default="Gaussiano", choices=FrequencyFilterBlock.SHAPES),
+        ParamSpec("cutoff", "Corte (0-1)", "float", 0.25, width=5),
+        ParamSpec("order", "Ordem", "int", 2, width=3),
+    ),
+    button="Adicionar filtro de frequência",
+))
+REG.register_block(BlockSpec(
+    "notch", "Filtro notch",
+    lambda points, radius: NotchFilterBlock(points, radius),
+    (
+        ParamSpec("points", "u,v; u,v", "text", "", width=20),
+        ParamSpec("radius", "Raio", "float", 3, width=4),
+    ),
+    button="Adicionar filtro notch",
+))
+REG.register_block(BlockSpec(
+    "components", "Componentes conexos",
+    lambda connectivity: ConnectedComponentsBlock(connectivity),
+    (ParamSpec("connectivity", "Conectividade", "choice", "8", ConnectedComponentsBlock.CONNECTIVITIES),),
+    button="Adicionar componentes conexos",
+))
+REG.register_block(BlockSpec(
+    "histogram", "Histograma",
+    lambda: HistogramBlock(),
+    button="Adicionar histograma",
+    headless=False,
+))
+REG.register_block(BlockSpec(
+    "difference", "Diferença com outra imagem RAW",
+    lambda path, width, height: DifferenceBlock(path, width, height),
+    (
+        ParamSpec("path", "Arquivo", "open_path", width=30, filetypes=_INPUT_FILETYPES),
+        ParamSpec("width", "Largura", "int", "", width=6),     # ignoradas para .psec
+        ParamSpec("height", "Altura", "int", "", width=6),
+    ),
+    button="Adicionar diferença",
+))
+#----------------------------------------------------------------------
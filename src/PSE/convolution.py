@@ -0,0 +1,157 @@
+"""
+Spatial correlation ("convolução local" of the PSE) with zero padding.
+
+The execution path is picked from the `Kernel` analysis:
+* integer and fixed-point kernels (weights m / 2^s, e.g. binomial masks)
+accumulate in integers: int16 when the worst case sum(|w|) * 255 fits, int32
+otherwise. The fixed-point result is shifted back with a floor division and
+the output saturates to 0..255, so results are exact and identical on every
+machine, and int16 halves the memory traffic compared with float32;
+* separable kernels run as a row pass followed by a column pass (2k instead
+of k² multiply-adds per pixel);
+* everything else accumulates shifted slices of the padded image, skipping
+zero weights.
+
+Every path replaces the original per-pixel Python loop and produces the
+same uint8 output (clipped to 0..255, fractional part truncated).
+"""
+
+# Internal Modules:
+import PSE.registry as REG
+from PSE.kernels import Kernel
+
+# External Modules:
+import numpy as np
+
+
+_INT16_MAX:int = np.iinfo(np.int16).max
+_INT32_MAX:int = np.iinfo(np.int32).max
+
+
+def plan(kernel:Kernel) -> tuple[str, type, int]:
+    """
+    Returns the execution plan for `kernel` as (path, accumulator dtype, shift):
+    - path: "integer-separable", "integer", "separable" or "direct";
+    - accumulator dtype: np.int16, np.int32 or np.float64;
+    - shift: fixed-point shift applied to integer results (0 for float paths).
+    """
+
+    separable_int = kernel.int_col is not None and kernel.size >= 3
+    if kernel.fixed_point_shift is not None:
+        bound = kernel.abs_sum * 255
+        if bound <= _INT32_MAX:
+            acc_dtype = np.int16 if bound <= _INT16_MAX else np.int32
+            path = "integer-separable" if separable_int else "integer"
+            return path, acc_dtype, kernel.fixed_point_shift
+
+    separable = kernel.is_separable and kernel.size >= 3
+    return ("separable" if separable else "direct"), np.float64, 0
+
+
+def select_path(kernel:Kernel) -> str:
+    """
+    Returns the execution path used for `kernel`: "integer-separable",
+    "integer", "separable" or "direct".
+    """
+
+    return plan(kernel)[0]
+
+
+def capability(kernel:Kernel) -> str:
+    """
+    Returns the capability an implementation of "correlate" needs for `kernel`,
+    from its execution plan: "integer", "fixed-point" (integer path with a
+    shift) or "float".
+    """
+
+    path, _, shift = plan(kernel)
+    if path.startswith("integer"):
+        return "fixed-point" if shift else "integer"
+    return "float"
+
+
+def _correlate_direct(padded:np.ndarray, weights:np.ndarray, h:int, w:int, acc_dtype) -> np.ndarray:
+    """Sum of weight * shifted slice over every nonzero weight (row-major order)."""
+
+    acc = np.zeros((h, w), dtype=acc_dtype)
+    kh, kw = weights.shape
+    for a in range(kh):
+        for b in range(kw):
+            weight = weights[a, b]
+            if weight != 0:
+                acc += weight * padded[a:a + h, b:b + w]
+    return acc
+
+
+def correlate(image:np.ndarray, kernel:Kernel) -> np.ndarray:
+    """
+    Correlates `image` with `kernel` (zero padding, same output shape).
+
+    Parameters:
+        - image: 2D uint8 image.
+        - kernel: Convolution mask.
+
+    Return:
+        uint8 image (result clipped to 0..255 and truncated).
+    """
+
+    path, acc_dtype, shift = plan(kernel)
+    k = kernel.size
+    pad = k // 2
+    h, w = image.shape
+
+    if path.startswith("integer"):
+        padded = np.pad(image.astype(acc_dtype), pad_width=pad, mode="constant", constant_values=0)
+        weights = kernel.int_values.astype(acc_dtype)
+        col = None if kernel.int_col is None else kernel.int_col.astype(acc_dtype)
+        row = None if kernel.int_row is None else kernel.int_row.astype(acc_dtype)
+    else:
+        padded = np.pad(image.astype(np.float64), pad_width=pad, mode="constant", constant_values=0)
+        weights, col, row = kernel.values, kernel.col, kernel.row
+
+    if path.endswith("separable"):
+        # passada nas linhas (todas as linhas do padding) e depois nas colunas
+        rows = _correlate_direct(padded, row[None, :], padded.shape[0], w, acc_dtype)
+        out = _correlate_direct(rows, col[:, None], h, w, acc_dtype)
+    else:
+        out = _correlate_direct(padded, weights, h, w, acc_dtype)
+
+    if acc_dtype is np.float64:
+        out = out.astype(np.float32)    # mesmo arredondamento do laço original (saída float32)
+    elif shift:
+        # negativos saturam em 0 de qualquer jeito, então floor == truncamento
+        out >>= shift
+
+    # saturação para 0..255
+    out = np.clip(out, 0, 255)
+    return out.astype(np.uint8)
+
+
+def estimate_memory(shape:tuple[int, int], kernel:Kernel) -> int:
+    """
+    Estimated peak bytes of `correlate` on an image of `shape`: accumulator
+    dtype copies of the image (cast, padded), accumulator and product
+    temporaries, the row pass of separable paths, the float32 copy of float
+    paths and the uint8 output.
+    """
+
+    path, acc_dtype, _ = plan(kernel)
+    item = np.dtype(acc_dtype).itemsize
+    h, w = shape
+    pad = kernel.size // 2
+    ph, pw = h + 2 * pad, w + 2 * pad
+
+    total = h * w * item + ph * pw * item + 3 * h * w * item + h * w
+    if path.endswith("separable"):
+        total += 2 * ph * w * item
+    if acc_dtype is np.float64:
+        total += 2 * h * w * 4
+    return total
+
+
+REG.register_implementation("correlate", "numpy", correlate, priority=0, capabilities=("integer", "fixed-point", "float"))
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
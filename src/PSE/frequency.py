@@ -0,0 +1,255 @@
+"""
+Frequency-domain helpers for the PSE blocks (real-input FFTs, filters and
+FFT based correlation).
+
+* Per-shape setup (optimal padded sizes, frequency grids, transfer functions
+and kernel spectra) is cached with `functools.lru_cache`, so it is computed
+once and reused by every frame with the same shape.
+* Image spectra are kept in a small run-level cache, so several frequency
+blocks applied to the same image object only transform it once. Call
+`clear_spectrum_cache` at the end of each pipeline run. The cache is per
+thread, so concurrent pipeline runs (streaming workers) never share it.
+"""
+
+# Native Modules:
+import threading
+from functools import lru_cache
+
+# Internal Modules:
+import PSE.telemetry as TEL
+
+# External Modules:
+import numpy as np
+
+
+_SPECTRUM_CACHE_SIZE:int = 4    # Maximum number of image spectra kept between blocks.
+
+# Per thread: (id(image), padded shape, padding mode) -> (image, spectrum)
+_spectrum_local = threading.local()
+
+
+def _spectrum_cache() -> dict[tuple, tuple[np.ndarray, np.ndarray]]:
+    cache = getattr(_spectrum_local, "cache", None)
+    if cache is None:
+        cache = _spectrum_local.cache = {}
+    return cache
+
+
+@lru_cache(maxsize=1024)
+def optimal_fft_size(n:int) -> int:
+    """
+    Returns the smallest 5-smooth number (2^a * 3^b * 5^c) greater than or
+    equal to `n`, which pocketfft transforms efficiently.
+
+    Parameters:
+        - n: Minimum transform length.
+    """
+
+    if n <= 1:
+        return 1
+
+    best = 2 ** int(np.ceil(np.log2(n)))
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            # menor potência de 2 que leva p35 até n
+            p = p35
+            while p < n:
+                p *= 2
+            best = min(best, p)
+            p35 *= 3
+        p5 *= 5
+
+    return best
+
+
+def optimal_fft_shape(shape:tuple[int, int]) -> tuple[int, int]:
+    """Returns `shape` with each axis rounded up to an optimal FFT size."""
+
+    return (optimal_fft_size(int(shape[0])), optimal_fft_size(int(shape[1])))
+
+
+@lru_cache(maxsize=32)
+def _frequency_grid(padded_shape:tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Frequency coordinates (cycles/pixel) of an `rfft2` spectrum with
+    `padded_shape`, as broadcastable (rows, 1) and (1, cols) arrays.
+    """
+
+    fy = np.fft.fftfreq(padded_shape[0])[:, None]
+    fx = np.fft.rfftfreq(padded_shape[1])[None, :]
+    fy.flags.writeable = False
+    fx.flags.writeable = False
+    return fy, fx
+
+
+def _padded(image:np.ndarray, padded_shape:tuple[int, int], mode:str) -> np.ndarray:
+    """Pads `image` at the end of each axis up to `padded_shape`."""
+
+    h, w = image.shape
+    pad = ((0, padded_shape[0] - h), (0, padded_shape[1] - w))
+    return np.pad(image.astype(np.float64), pad, mode=mode)
+
+
+def spectrum(image:np.ndarray, padded_shape:tuple[int, int], mode:str="constant") -> np.ndarray:
+    """
+    Returns the (read-only) `rfft2` of `image` padded to `padded_shape`.
+
+    The result is cached by image identity for the current run, so the
+    same image transformed by several blocks is only transformed once.
+
+    Parameters:
+        - image: 2D image.
+        - padded_shape: Transform shape (see `optimal_fft_shape`).
+        - mode: `np.pad` mode used to fill the padding ("constant" = zeros).
+    """
+
+    cache = _spectrum_cache()
+    key = (id(image), tuple(padded_shape), mode)
+    cached = cache.get(key)
+    if cached is not None and cached[0] is image:
+        TEL.cache_access("spectrum", True)
+        return cached[1]
+    TEL.cache_access("spectrum", False)
+
+    spec = np.fft.rfft2(_padded(image, padded_shape, mode), s=padded_shape)
+    spec.flags.writeable = False
+
+    if len(cache) >= _SPECTRUM_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[key] = (image, spec)
+
+    return spec
+
+
+def clear_spectrum_cache() -> None:
+    """Drops every image spectrum cached by the calling thread (call at the end of a pipeline run)."""
+
+    _spectrum_cache().clear()
+
+
+@lru_cache(maxsize=32)
+def lowpass_transfer(
+    padded_shape:tuple[int, int], shape:str, cutoff:float, order:int
+) -> np.ndarray:
+    """
+    Low-pass transfer function on the `rfft2` grid of `padded_shape`.
+
+    Parameters:
+        - padded_shape: Transform shape.
+        - shape: "Ideal", "Gaussiano" or "Butterworth".
+        - cutoff: Cut-off radius in cycles/pixel (0 < cutoff <= 0.5).
+        - order: Butterworth order.
+    """
+
+    fy, fx = _frequency_grid(padded_shape)
+    d = np.sqrt(fy * fy + fx * fx)
+
+    if shape == "Ideal":
+        h = (d <= cutoff).astype(np.float64)
+    elif shape == "Gaussiano":
+        h = np.exp(-(d * d) / (2.0 * cutoff * cutoff))
+    elif shape == "Butterworth":
+        h = 1.0 / (1.0 + (d / cutoff) ** (2 * order))
+    else:
+        raise ValueError(f"Formato de filtro desconhecido: {shape}")
+
+    h.flags.writeable = False
+    return h
+
+
+@lru_cache(maxsize=32)
+def notch_transfer(
+    padded_shape:tuple[int, int],
+    image_shape:tuple[int, int],
+    points:tuple[tuple[int, int], ...],
+    radius:float,
+) -> np.ndarray:
+    """
+    Gaussian notch-reject transfer function on the `rfft2` grid.
+
+    Parameters:
+        - padded_shape: Transform shape.
+        - image_shape: Original image shape, `points` and `radius` are given
+        in cycles per image along each axis.
+        - points: (u, v) frequencies to reject; the symmetric (-u, -v) notch is
+        always added.
+        - radius: Notch radius in cycles per image.
+    """
+
+    fy, fx = _frequency_grid(padded_shape)
+    h_img, w_img = image_shape
+    h = np.ones((padded_shape[0], padded_shape[1] // 2 + 1), dtype=np.float64)
+
+    for u, v in points:
+        for su, sv in ((u, v), (-u, -v)):
+            dy = (fy - su / h_img) * h_img
+            dx = (fx - sv / w_img) * w_img
+            h *= 1.0 - np.exp(-(dy * dy + dx * dx) / (2.0 * radius * radius))
+
+    h.flags.writeable = False
+    return h
+
+
+def filter_image(image:np.ndarray, transfer:np.ndarray, padded_shape:tuple[int, int]) -> np.ndarray:
+    """
+    Multiplies the spectrum of `image` (reflect-padded to `padded_shape`) by
+    `transfer` and returns the real result cropped to the image shape.
+    """
+
+    spec = spectrum(image, padded_shape, mode="reflect")
+    out = np.fft.irfft2(spec * transfer, s=padded_shape)
+    return out[:image.shape[0], :image.shape[1]]
+
+
+@lru_cache(maxsize=16)
+def _kernel_spectrum(kernel_bytes:bytes, k:int, padded_shape:tuple[int, int]) -> np.ndarray:
+    """Spectrum of the flipped kernel (correlation = convolution with the flipped mask)."""
+
+    kernel = np.frombuffer(kernel_bytes, dtype=np.float64).reshape((k, k))
+    spec = np.fft.rfft2(kernel[::-1, ::-1], s=padded_shape)
+    spec.flags.writeable = False
+    return spec
+
+
+def fft_correlate(image:np.ndarray, kernel:np.ndarray) -> np.ndarray:
+    """
+    Same result as `ConvolutionBlock` (correlation with zero padding, output
+    with the image shape), computed with real FFTs.
+
+    Parameters:
+        - image: 2D image.
+        - kernel: Square (k x k) mask.
+
+    Return:
+        float64 array with the image shape.
+    """
+
+    k = kernel.shape[0]
+    offset = k - 1 - k // 2     # índice da saída "same" dentro da convolução completa
+    h, w = image.shape
+    padded_shape = optimal_fft_shape((h + k - 1, w + k - 1))
+
+    kernel = np.ascontiguousarray(kernel, dtype=np.float64)
+    kspec = _kernel_spectrum(kernel.tobytes(), k, padded_shape)
+    full = np.fft.irfft2(spectrum(image, padded_shape) * kspec, s=padded_shape)
+
+    return full[offset:offset + h, offset:offset + w]
+
+
+def estimate_memory(shape:tuple[int, int], padded_shape:tuple[int, int]) -> int:
+    """
+    Estimated peak bytes of one FFT filtering of an image of `shape` padded
+    to `padded_shape`: padded float64 image, image spectrum and product
+    (complex128), inverse transform, float64 crop/clip copies and uint8 output.
+    """
+
+    ph, pw = padded_shape
+    h, w = shape
+    return ph * pw * 16 + ph * (pw // 2 + 1) * 32 + h * w * 17
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
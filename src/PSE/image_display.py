@@ -1,4 +1,8 @@
 """
+Image and histogram display helpers (MatPlotLib).
+
+* MatPlotLib is imported on first use, so importing this module (and the
+blocks / readers that depend on it) stays numpy-only.
 """
 
 # Internal Modules:
@@ -6,7 +10,13 @@ from constants import PROJECT_NAME
 
 # External Modules:
 import numpy as np
-import matplotlib.pyplot as mpl
+
+
+def _pyplot():
+    """Imports and returns `matplotlib.pyplot` (loaded only on the first call)."""
+
+    import matplotlib.pyplot as mpl
+    return mpl
 
 
 def display(image:np.ndarray, title:str|None=None) -> None:
@@ -18,6 +28,8 @@ def display(image:np.ndarray, title:str|None=None) -> None:
         - title: Optional -> A string to be displayed as the image title.
     """
 
+    mpl = _pyplot()
+
     fig = mpl.figure()
     fig.canvas.manager.set_window_title(PROJECT_NAME)
 
@@ -28,6 +40,28 @@ def display(image:np.ndarray, title:str|None=None) -> None:
     mpl.show()
 
 
+def histogram(hist:np.ndarray, title:str="Histograma") -> None:
+    """
+    This functions plots a 256 bins histogram to the screen using MatPlotLib.
+
+    Parameters:
+        - hist: The histogram counts (one value per intensity level).
+        - title: Optional -> A string to be displayed as the plot title.
+    """
+
+    mpl = _pyplot()
+
+    fig = mpl.figure()
+    fig.canvas.manager.set_window_title(PROJECT_NAME)
+
+    mpl.bar(range(len(hist)), hist)
+    mpl.title(title)
+    mpl.xlabel("Intensidade")
+    mpl.ylabel("Frequência")
+
+    mpl.show()
+
+
 # This is NOT a script file.
 if __name__ == '__main__':
     raise RuntimeError("This module is not a standalone script.")
@@ -0,0 +1,308 @@
+"""
+Immutable convolution masks (kernels), their analysis and presets.
+
+* A `Kernel` is built once per distinct content and cached by content hash
+(`get_kernel`); the text cells of the GUI are parsed and cached the same way
+(`parse_kernel`), so repeated runs and batch frames reuse the same object.
+* On creation the kernel is analyzed once (sum, integrality, fixed-point
+representation, symmetry, separability), and the convolution module uses that
+analysis to pick the fastest exact execution path.
+* Telemetry records the accesses of both caches: "kernel" for the parsed
+cells (every flow and GUI kernel goes through it) and "kernel_content" for
+the content cache behind it.
+"""
+
+# Native Modules:
+import hashlib
+import threading
+from functools import lru_cache
+
+# Internal Modules:
+import PSE.telemetry as TEL
+
+# External Modules:
+import numpy as np
+
+
+PRESETS:tuple[str, ...] = ("Média", "Laplaciano (4-vizinhos)", "Laplaciano (8-vizinhos)")
+
+_SEPARABLE_TOLERANCE:float = 1e-12     # Relative reconstruction error accepted for separable factors.
+_KERNEL_CACHE_SIZE:int      = 256       # Maximum number of distinct kernels kept by `get_kernel`.
+FIXED_POINT_MAX_SHIFT:int   = 16        # Largest power of two tried for the fixed-point representation.
+_PRESET_TOLERANCE:float     = 1e-4      # GUI cells show presets with 4 decimals (`format_weight`).
+
+_kernel_cache:dict[str, "Kernel"] = {}
+_kernel_cache_lock = threading.Lock()    # `get_kernel` is called from streaming worker threads.
+
+_parsed_cache:dict[tuple, "Kernel"] = {}    # Text cells -> kernel (`parse_kernel`).
+_parsed_cache_lock = threading.Lock()
+
+
+class Kernel:
+    """
+    Immutable square convolution mask with its analysis.
+
+    Attributes (read-only):
+        - `values`: float64 (k, k) array (not writeable).
+        - `size`: k.
+        - `key`: Content hash (hex string).
+        - `sum`: Sum of the weights.
+        - `is_integer`: All weights are integers.
+        - `is_symmetric`: Equal to its 180° rotation (correlation == convolution).
+        - `is_separable`: Rank one, `values == outer(col, row)`.
+        - `col` / `row`: Separable factors (`None` when not separable); integer
+        valued when the kernel is integer and an exact integer factorization exists.
+        - `fixed_point_shift`: Smallest `s` (0..FIXED_POINT_MAX_SHIFT) such that
+        `values * 2**s` is exactly integer, `None` when there is none (e.g. 1/9).
+        `0` for integer kernels.
+        - `int_values`: int64 `values * 2**fixed_point_shift` (or `None`).
+        - `int_col` / `int_row`: Exact integer separable factors of `int_values` (or `None`).
+        - `abs_sum`: Sum of the absolute weights of `int_values` (or `None`).
+    """
+
+    __slots__ = (
+        "values", "size", "key", "sum", "is_integer", "is_symmetric", "is_separable", "col", "row",
+        "fixed_point_shift", "int_values", "int_col", "int_row", "abs_sum",
+    )
+
+    def __init__(self, values:np.ndarray) -> None:
+        """
+        Builds and analyzes a kernel. Prefer `get_kernel`, which reuses the
+        cached object for the same content.
+
+        Parameters:
+            - values: Square 2D array-like of weights.
+        """
+
+        arr = np.array(values, dtype=np.float64)
+        if arr.ndim != 2 or arr.shape[0] != arr.shape[1] or arr.shape[0] == 0:
+            raise ValueError("A máscara deve ser uma matriz quadrada não vazia.")
+        if not np.all(np.isfinite(arr)):
+            raise ValueError("A máscara contém valores não finitos.")
+        arr.flags.writeable = False
+
+        set_ = object.__setattr__
+        set_(self, "values", arr)
+        set_(self, "size", arr.shape[0])
+        set_(self, "key", _content_key(arr))
+        set_(self, "sum", float(arr.sum()))
+        set_(self, "is_integer", bool(np.all(arr == np.round(arr))))
+        set_(self, "is_symmetric", bool(np.array_equal(arr, arr[::-1, ::-1])))
+
+        col, row = _separable_factors(arr, self.is_integer)
+        set_(self, "is_separable", col is not None)
+        set_(self, "col", col)
+        set_(self, "row", row)
+
+        shift = _fixed_point_shift(arr)
+        set_(self, "fixed_point_shift", shift)
+        if shift is None:
+            for name in ("int_values", "int_col", "int_row", "abs_sum"):
+                set_(self, name, None)
+        else:
+            ints = (arr * (1 << shift)).astype(np.int64)
+            ints.flags.writeable = False
+            int_col, int_row = _separable_factors(ints.astype(np.float64), True)
+            set_(self, "int_values", ints)
+            set_(self, "int_col", None if int_col is None else _readonly(int_col.astype(np.int64)))
+            set_(self, "int_row", None if int_row is None else _readonly(int_row.astype(np.int64)))
+            set_(self, "abs_sum", int(np.abs(ints).sum()))
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError("Kernel objects are immutable.")
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Kernel) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        flags = [n for n in ("is_integer", "is_symmetric", "is_separable") if getattr(self, n)]
+        return f"Kernel({self.size}x{self.size}, sum={self.sum:g}, {', '.join(flags) or 'general'})"
+
+
+def _readonly(values:np.ndarray) -> np.ndarray:
+    values.flags.writeable = False
+    return values
+
+
+def _fixed_point_shift(values:np.ndarray) -> int|None:
+    """Smallest `s` with `values * 2**s` integer (exact in float64), or `None`."""
+
+    for shift in range(FIXED_POINT_MAX_SHIFT + 1):
+        scaled = values * (1 << shift)     # multiplicar por potência de 2 é exato
+        if np.all(scaled == np.round(scaled)):
+            return shift
+    return None
+
+
+def _content_key(values:np.ndarray) -> str:
+    digest = hashlib.sha1(values.tobytes())
+    digest.update(str(values.shape).encode())
+    return digest.hexdigest()
+
+
+def _separable_factors(values:np.ndarray, is_integer:bool) -> tuple[np.ndarray|None, np.ndarray|None]:
+    """
+    Rank-one factorization `values == outer(col, row)`, or (None, None).
+
+    Integer kernels are factored exactly with integers (pivot row / column
+    divided by their gcd); other kernels through the SVD, accepted only within
+    `_SEPARABLE_TOLERANCE`.
+    """
+
+    if values.shape[0] == 1 or not np.any(values):
+        return None, None
+
+    if is_integer:
+        ints = values.astype(np.int64)
+        i, j = np.unravel_index(np.argmax(np.abs(ints)), ints.shape)
+        row = ints[i]
+        g = np.gcd.reduce(row)
+        row = row // g
+        if np.all(ints[:, j] % row[j] == 0):
+            col = ints[:, j] // row[j]
+            if np.array_equal(np.outer(col, row), ints):
+                col = col.astype(np.float64)
+                row = row.astype(np.float64)
+                col.flags.writeable = False
+                row.flags.writeable = False
+                return col, row
+        return None, None
+
+    u, s, vt = np.linalg.svd(values)
+    col = u[:, 0] * np.sqrt(s[0])
+    row = vt[0] * np.sqrt(s[0])
+    if np.max(np.abs(np.outer(col, row) - values)) > _SEPARABLE_TOLERANCE * np.max(np.abs(values)):
+        return None, None
+
+    col.flags.writeable = False
+    row.flags.writeable = False
+    return col, row
+
+
+def get_kernel(values) -> Kernel:
+    """
+    Returns the cached `Kernel` with the given weights (built and analyzed on
+    the first request).
+
+    Parameters:
+        - values: Square 2D array-like of weights.
+    """
+
+    arr = np.asarray(values, dtype=np.float64)
+    key = _content_key(arr)
+    with _kernel_cache_lock:
+        kernel = _kernel_cache.get(key)
+        hit = kernel is not None
+        if not hit:
+            kernel = Kernel(arr)
+            if len(_kernel_cache) >= _KERNEL_CACHE_SIZE:
+                _kernel_cache.pop(next(iter(_kernel_cache)))
+            _kernel_cache[key] = kernel
+    TEL.cache_access("kernel_content", hit)
+    return kernel
+
+
+def parse_kernel(cells:tuple[tuple[str, ...], ...]) -> Kernel:
+    """
+    Parses a square grid of text cells (GUI entries) into a cached `Kernel`.
+
+    Parameters:
+        - cells: Tuple of rows, each one a tuple of cell strings.
+
+    Raises:
+        ValueError if the grid is not square or a cell is not a number (the
+        message tells which cell).
+    """
+
+    with _parsed_cache_lock:
+        kernel = _parsed_cache.get(cells)
+    TEL.cache_access("kernel", kernel is not None)
+    if kernel is not None:
+        return kernel
+
+    kernel = _parse_cells(cells)
+    with _parsed_cache_lock:
+        if len(_parsed_cache) >= _KERNEL_CACHE_SIZE:
+            _parsed_cache.pop(next(iter(_parsed_cache)))
+        _parsed_cache[cells] = kernel
+    return kernel
+
+
+def _parse_cells(cells:tuple[tuple[str, ...], ...]) -> Kernel:
+    n = len(cells)
+    if n == 0:
+        raise ValueError("Kernel não definido: matriz de entradas vazia.")
+
+    values = np.empty((n, n), dtype=np.float64)
+    for i, row in enumerate(cells):
+        if len(row) != n:
+            raise ValueError("Matriz de entradas não é quadrada.")
+        for j, cell in enumerate(row):
+            try:
+                values[i, j] = float(cell.strip().replace(",", "."))
+            except ValueError:
+                raise ValueError(f"Valor inválido na máscara (linha {i + 1}, coluna {j + 1}): '{cell}'")
+
+    return get_kernel(values)
+
+
+@lru_cache(maxsize=64)
+def preset_kernel(preset:str, n:int) -> Kernel|None:
+    """
+    Builds a preset mask of size `n` x `n`.
+
+    Parameters:
+        - preset: One of `PRESETS`.
+        - n: Mask size.
+
+    Return:
+        The cached `Kernel`, or `None` when the preset does not apply to the
+        size (Laplacians need n >= 3).
+    """
+
+    if preset == "Média":
+        return get_kernel(np.full((n, n), 1.0 / (n * n)))
+
+    if n < 3:
+        return None
+
+    values = np.zeros((n, n), dtype=np.float64)
+    c = n // 2
+
+    if preset == "Laplaciano (4-vizinhos)":
+        values[c, c] = 4
+        values[[c - 1, c + 1, c, c], [c, c, c - 1, c + 1]] = -1
+    elif preset == "Laplaciano (8-vizinhos)":
+        values[c - 1:c + 2, c - 1:c + 2] = -1
+        values[c, c] = 8
+    else:
+        raise ValueError(f"Máscara pré-definida desconhecida: {preset}")
+
+    return get_kernel(values)
+
+
+def match_preset(kernel:Kernel) -> str|None:
+    """
+    Returns the preset (one of `PRESETS`) whose mask of the same size equals
+    `kernel` (up to the rounding of the GUI cells), `None` for custom masks.
+    """
+
+    for preset in PRESETS:
+        candidate = preset_kernel(preset, kernel.size)
+        if candidate is not None and np.allclose(kernel.values, candidate.values, rtol=0, atol=_PRESET_TOLERANCE):
+            return preset
+    return None
+
+
+def format_weight(value:float) -> str:
+    """Text shown in a GUI cell for a weight (integers without decimals)."""
+
+    return str(int(value)) if value == int(value) else f"{value:.4f}"
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
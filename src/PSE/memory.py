@@ -0,0 +1,250 @@
+"""
+Memory budget of the pipeline executor.
+
+* Every block estimates its peak memory (temporaries included) from the image
+shape (`Block.estimate_memory`) before it runs.
+* When input + temporaries + output would exceed the budget (config.ini,
+section [memory]), the block is planned differently:
+    - tileable blocks (`Block.tile_halo` is not `None`) run on strips of rows
+    extended by the halo, the halo rows being cropped from each result, so the
+    output is identical to a single run;
+    - the input and/or output images are spilled to memory-mapped temporary
+    files, so only the block temporaries stay resident;
+    - if even that does not fit, `MemoryError` is raised before the block runs.
+* The pipeline input may also be a chunked file (`CF.ChunkedFile`) that was
+not decoded yet: its decoded size counts against the budget, a tiled first
+block decodes only its strips (`ChunkedFile.read_region`) and other plans
+decode it whole, in memory or into a spill file.
+"""
+
+# Native Modules:
+import tempfile
+from pathlib import Path
+
+# Internal Modules:
+from FileHandling.config_reading import read_config
+import FileHandling.chunked_format as CF
+import PSE.telemetry as TEL
+
+# External Modules:
+import numpy as np
+
+
+STRATEGIES:tuple[str, ...] = ("memory", "tiled", "spilled")
+CONFIGURED:int = -1     # `run_pipeline` default: use the budget of config.ini.
+
+_MIB:int = 1024 * 1024
+
+
+def configured_budget() -> int|None:
+    """Memory budget in bytes from config.ini ([memory] budget_mb), `None` when unlimited."""
+
+    budget_mb = read_config().getfloat("memory", "budget_mb", fallback=0.0)
+    return int(budget_mb * _MIB) if budget_mb > 0 else None
+
+
+def configured_spill_dir() -> Path|None:
+    """Directory of the spill files from config.ini ([memory] spill_dir), `None` for the system default."""
+
+    spill_dir = read_config().get("memory", "spill_dir", fallback="").strip()
+    return Path(spill_dir) if spill_dir else None
+
+
+def resident_bytes(array:np.ndarray) -> int:
+    """Bytes of `array` held in RAM (0 for memory-mapped arrays)."""
+
+    return 0 if isinstance(array, np.memmap) else array.nbytes
+
+
+def decoded_bytes(image) -> int:
+    """Bytes of `image` once decoded (arrays and chunked files)."""
+
+    return int(np.prod(image.shape)) * np.dtype(image.dtype).itemsize
+
+
+def rows(image, y0:int, y1:int) -> np.ndarray:
+    """Rows [y0, y1) of `image` (only the chunks they touch, for a chunked file)."""
+
+    if isinstance(image, CF.ChunkedFile):
+        return image.read_region(y0, y1, 0, image.shape[1])
+    return image[y0:y1]
+
+
+def load(image) -> np.ndarray:
+    """`image` as an array (a chunked file is decoded whole)."""
+
+    if isinstance(image, CF.ChunkedFile):
+        return image.read_all()
+    return image
+
+
+def spill_array(shape:tuple[int, ...], dtype, directory:Path|None=None) -> np.memmap:
+    """
+    Allocates an array backed by an anonymous temporary file (deleted by the
+    system when the array is released).
+    """
+
+    if directory is not None:
+        directory.mkdir(parents=True, exist_ok=True)
+    handle = tempfile.TemporaryFile(dir=directory)
+    array = np.memmap(handle, dtype=dtype, mode="w+", shape=shape)
+    array.spill_file = handle   # mantém o arquivo aberto enquanto o array existir
+    return array
+
+
+def spill(array, directory:Path|None=None) -> np.ndarray:
+    """
+    Memory-mapped copy of `array` (`array` itself when already mapped). A
+    chunked file is decoded straight into the spill file, one row of chunks
+    at a time.
+    """
+
+    if isinstance(array, np.memmap):
+        return array
+    spilled = spill_array(array.shape, array.dtype, directory)
+    if isinstance(array, CF.ChunkedFile):
+        band = array.chunk_shape[0]
+        for y0 in range(0, array.shape[0], band):
+            spilled[y0:y0 + band] = rows(array, y0, y0 + band)
+    else:
+        spilled[...] = array
+    TEL.emit("spill", "input", bytes=decoded_bytes(array))
+    return spilled
+
+
+class BlockPlan:
+    """
+    How a block runs under the memory budget.
+
+    Attributes:
+        - `strategy`: "memory", "tiled" or "spilled".
+        - `estimate`: Estimated temporaries of a single full run (bytes).
+        - `spill_input` / `spill_output`: Whether the input / output image go to
+        memory-mapped temporary files.
+        - `tile_rows` / `halo`: Strip height and halo rows ("tiled" only).
+    """
+
+    def __init__(
+        self,
+        strategy:str,
+        estimate:int,
+        spill_input:bool=False,
+        spill_output:bool=False,
+        tile_rows:int=0,
+        halo:int=0,
+    ) -> None:
+        self.strategy       = strategy
+        self.estimate       = estimate
+        self.spill_input    = spill_input
+        self.spill_output   = spill_output
+        self.tile_rows      = tile_rows
+        self.halo           = halo
+
+    def describe(self) -> str:
+        """Short (Portuguese) description, used in run reports."""
+
+        text = {"memory": "em memória", "tiled": f"em faixas de {self.tile_rows} linhas", "spilled": "com despejo em disco"}
+        spilled = [name for name, flag in (("entrada", self.spill_input), ("saída", self.spill_output)) if flag]
+        suffix = f" ({', '.join(spilled)} em disco)" if spilled and self.strategy == "tiled" else ""
+        return f"{text[self.strategy]}{suffix}, estimativa {self.estimate / _MIB:.1f} MiB"
+
+
+def plan_block(block, image, budget:int|None) -> BlockPlan:
+    """
+    Chooses how `block` runs on `image` (array or chunked file) within
+    `budget` bytes.
+
+    Raises:
+        MemoryError if the block cannot run within the budget in any way.
+    """
+
+    shape = image.shape
+    estimate = block.estimate_memory(shape)
+    if budget is None:
+        return BlockPlan("memory", estimate)
+
+    chunked = isinstance(image, CF.ChunkedFile)
+    # um arquivo em blocos ainda não está na memória, mas será decodificado
+    held = decoded_bytes(image) if chunked else resident_bytes(image)
+    out_bytes = shape[0] * shape[1]     # blocos produzem imagens uint8
+    if held + estimate + out_bytes <= budget:
+        return BlockPlan("memory", estimate)
+
+    name = type(block).__name__
+    halo = block.tile_halo(shape)
+
+    if halo is not None and shape[0] > 1:
+        # saída e entrada vão para o disco só se for preciso para caber uma faixa
+        if chunked:
+            # só as faixas são decodificadas (entram na conta de cada faixa)
+            options, held = ((False, False), (True, False)), 0
+        else:
+            options = ((False, False), (True, False), (True, True))
+        for spill_output, spill_input in options:
+            available = budget - (0 if spill_output else out_bytes) - (0 if spill_input else held)
+            tile_rows = _tile_rows(block, shape, halo, available, decoded=chunked)
+            if tile_rows:
+                return BlockPlan("tiled", estimate, spill_input, spill_output, tile_rows, halo)
+
+        raise MemoryError(
+            f"O bloco {name} não cabe no orçamento de memória ({budget / _MIB:.1f} MiB) "
+            f"nem processando uma linha por vez."
+        )
+
+    if estimate + out_bytes <= budget:
+        return BlockPlan("spilled", estimate, spill_input=held > 0)
+
+    raise MemoryError(
+        f"O bloco {name} precisa de ~{(estimate + out_bytes) / _MIB:.1f} MiB, acima do "
+        f"orçamento de memória ({budget / _MIB:.1f} MiB), e não pode ser executado em faixas."
+    )
+
+
+def _tile_rows(block, shape:tuple[int, int], halo:int, available:int, decoded:bool=False) -> int:
+    """
+    Largest strip height (0 if none) whose run fits in `available` bytes
+    (`decoded`: each strip is also decoded from a chunked file).
+    """
+
+    h, w = shape
+    tile_rows = h
+    while tile_rows >= 1:
+        strip = (min(h, tile_rows + 2 * halo), w)
+        needed = block.estimate_memory(strip) + (strip[0] * w if decoded else 0)
+        if needed <= available:
+            return tile_rows
+        tile_rows //= 2
+    return 0
+
+
+def run_tiled(block, image, plan:BlockPlan, spill_dir:Path|None=None) -> np.ndarray:
+    """
+    Runs `block` on strips of `plan.tile_rows` rows (plus `plan.halo` rows of
+    context on each side) and assembles the cropped results. `image` may be a
+    chunked file, whose strips are then decoded one at a time.
+    """
+
+    h = image.shape[0]
+    tile_rows, halo = plan.tile_rows, plan.halo
+    name = type(block).__name__
+    out:np.ndarray|None = None
+
+    for y0 in range(0, h, tile_rows):
+        y1 = min(h, y0 + tile_rows)
+        a, b = max(0, y0 - halo), min(h, y1 + halo)
+        with TEL.span("tile", name, rows=[y0, y1], halo=halo):
+            strip = block.apply(rows(image, a, b))
+
+        if out is None:
+            shape = (h,) + strip.shape[1:]
+            out = spill_array(shape, strip.dtype, spill_dir) if plan.spill_output else np.empty(shape, strip.dtype)
+            if plan.spill_output:
+                TEL.emit("spill", "output", bytes=out.nbytes)
+        out[y0:y1] = strip[y0 - a:y1 - a]
+
+    return out
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
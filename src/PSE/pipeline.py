@@ -0,0 +1,250 @@
+"""
+Pipeline executor for PSE blocks (eager or lazy).
+
+* Eager mode runs every block in order, exactly like the original GUI loop.
+* Lazy mode first builds a deferred computation graph and then only evaluates
+the nodes feeding a sink (display, RAW saving, histogram and, optionally, the
+final output). Blocks whose result is never consumed are skipped entirely.
+* Under a memory budget (config.ini by default, see `PSE.memory`) every block
+is planned before it runs: in memory, in strips of rows, or with the images
+spilled to memory-mapped temporary files.
+* Runs and blocks are recorded as telemetry spans (`PSE.telemetry`) when
+recording is enabled.
+"""
+
+# Native Modules:
+import time
+
+# Internal Modules:
+import PSE.blocks as blocks
+import PSE.frequency as FQ
+import PSE.memory as MEM
+import PSE.telemetry as TEL
+
+# External Modules:
+import numpy as np
+
+
+class PipelineResult:
+    """
+    Result of a pipeline run.
+
+    Attributes:
+        - `image`: Final image of the pipeline, `None` when it was not computed
+        (lazy mode without final output).
+        - `timings`: List of (block index, block name, seconds) for every block
+        that was actually executed, in execution order.
+        - `skipped`: List of (block index, block name) for blocks that were not
+        executed because nothing consumed their result.
+        - `reports`: List of (block index, block name, report) with the structured
+        results (`Block.report`) of the executed blocks that produce one.
+        - `memory`: List of (block index, block name, `MEM.BlockPlan`) for every
+        executed block, when the run has a memory budget.
+        - `run_id`: Process-wide id of the run (the "run" argument of its
+        telemetry events).
+    """
+
+    def __init__(self) -> None:
+        self.run_id:int                             = TEL.next_run_id()
+        self.image:np.ndarray|None                  = None
+        self.timings:list[tuple[int, str, float]]   = []
+        self.skipped:list[tuple[int, str]]          = []
+        self.reports:list[tuple[int, str, dict]]    = []
+        self.memory:list[tuple[int, str, MEM.BlockPlan]] = []
+
+
+class _Budget:
+    """Memory budget of one run (`None` bytes = unlimited) and spill directory."""
+
+    def __init__(self, budget:int|None, spill_dir) -> None:
+        self.budget     = budget
+        self.spill_dir  = spill_dir
+
+
+class _Node:
+    """
+    Deferred block application: the value is computed on first request and
+    memoized, so nodes shared by several sinks are evaluated only once.
+    """
+
+    def __init__(self, block:blocks.Block|None, parent:"_Node|None", index:int=-1) -> None:
+        self.block      = block
+        self.parent     = parent
+        self.index      = index
+        self.value:np.ndarray|None = None
+
+    def evaluate(self, result:PipelineResult, budget:_Budget) -> np.ndarray:
+        """Evaluates this node and every pending ancestor (iteratively, oldest first)."""
+
+        pending:list[_Node] = []
+        node = self
+        while node.value is None:
+            pending.append(node)
+            node = node.parent
+
+        for node in reversed(pending):
+            plan, node.parent.value = _plan_block(node.block, node.parent.value, node.index, result, budget)
+            node.value = _apply_block(node.block, node.parent.value, node.index, result, plan, budget)
+
+        return self.value
+
+
+def _plan_block(
+    block:blocks.Block,
+    image:np.ndarray,
+    index:int,
+    result:PipelineResult,
+    budget:_Budget,
+) -> tuple[MEM.BlockPlan|None, np.ndarray]:
+    """
+    Plans `block` under the memory budget and records the plan in `result`.
+
+    Return:
+        (plan, image): `plan` is `None` without a budget, and `image` is the
+        input the block runs on: the spilled copy when the plan requires it,
+        and a chunked input decoded unless the block runs in strips (callers
+        replace their reference so the in-memory input can be released).
+    """
+
+    if budget.budget is None:
+        return None, MEM.load(image)
+
+    plan = MEM.plan_block(block, image, budget.budget)
+    result.memory.append((index, type(block).__name__, plan))
+    if plan.spill_input:
+        image = MEM.spill(image, budget.spill_dir)
+    elif plan.strategy != "tiled":
+        image = MEM.load(image)
+    return plan, image
+
+
+def _apply_block(
+    block:blocks.Block,
+    image:np.ndarray,
+    index:int,
+    result:PipelineResult,
+    plan:MEM.BlockPlan|None=None,
+    budget:_Budget|None=None,
+) -> np.ndarray:
+    """Applies one block (in strips when planned so) and records its wall time and report in `result`."""
+
+    name = type(block).__name__
+    strategy = "memory" if plan is None else plan.strategy
+
+    with TEL.span("block", name, run=result.run_id, index=index, strategy=strategy, shape=image.shape):
+        start = time.perf_counter()
+        if strategy == "tiled":
+            out = MEM.run_tiled(block, image, plan, budget.spill_dir)
+        else:
+            out = block.apply(image)
+        result.timings.append((index, name, time.perf_counter() - start))
+
+    report = block.report()
+    if report is not None:
+        result.reports.append((index, type(block).__name__, report))
+    return out
+
+
+def run_pipeline(
+    image:np.ndarray,
+    block_list:list[blocks.Block],
+    lazy:bool=False,
+    keep_output:bool=True,
+    level:int=0,
+    memory_budget:int|None=MEM.CONFIGURED,
+) -> PipelineResult:
+    """
+    Runs `block_list` over `image`, top to bottom.
+
+    Parameters:
+        - image: Input image, or a chunked file not decoded yet
+        (`RawImageReader.source`), decoded within the memory budget.
+        - block_list: Ordered list of blocks.
+        - lazy: Optional -> Only evaluates blocks that feed a sink or a report
+        producing block (`Block.produces_report`).
+        - keep_output: Optional -> In lazy mode, whether the final image counts
+        as a sink (eager mode always computes it).
+        - level: Optional -> Pyramid level of `image` (previews); every block is
+        replaced by `block.for_level(level)` and blocks that return `None`
+        (e.g. RAW saving) are left out.
+        - memory_budget: Optional -> Memory budget in bytes (`None` = unlimited);
+        by default the budget of config.ini ([memory] budget_mb).
+
+    Return:
+        A `PipelineResult` with the final image and the per-block timings.
+    """
+
+    result = PipelineResult()
+    if memory_budget == MEM.CONFIGURED:
+        memory_budget = MEM.configured_budget()
+    budget = _Budget(memory_budget, MEM.configured_spill_dir())
+
+    indexed:list[tuple[int, blocks.Block]] = []
+    for index, block in enumerate(block_list):
+        block = block.for_level(level) if level else block
+        if block is not None:
+            indexed.append((index, block))
+
+    try:
+        with TEL.span("run", "pipeline", run=result.run_id, blocks=len(indexed), lazy=lazy, level=level) as end_args:
+            _run(image, indexed, lazy, keep_output, result, budget)
+            if result.image is not None:
+                result.image = MEM.load(result.image)
+            end_args["executed"] = len(result.timings)
+            end_args["skipped"] = len(result.skipped)
+    finally:
+        FQ.clear_spectrum_cache()
+
+    return result
+
+
+def _run(
+    image:np.ndarray,
+    indexed:list[tuple[int, blocks.Block]],
+    lazy:bool,
+    keep_output:bool,
+    result:PipelineResult,
+    budget:_Budget,
+) -> None:
+    """Runs the (already level-adapted) blocks of `run_pipeline` into `result`."""
+
+    if not lazy:
+        current = image
+        for index, block in indexed:
+            plan, current = _plan_block(block, current, index, result, budget)
+            current = _apply_block(block, current, index, result, plan, budget)
+        result.image = current
+        return
+
+    # Sinks do not change the image, so they hang off the graph as leaves
+    # and the chain continues from their input node. Report producing blocks
+    # stay in the chain but are consumers too: their report is a result.
+    source = _Node(None, None)
+    source.value = image
+
+    current = source
+    nodes:list[_Node] = []
+    consumers:list[_Node] = []
+    for index, block in indexed:
+        node = _Node(block, current, index)
+        nodes.append(node)
+        if block.is_sink or block.produces_report:
+            consumers.append(node)
+        if not block.is_sink:
+            current = node
+
+    for consumer in consumers:
+        consumer.evaluate(result, budget)
+    if keep_output:
+        result.image = current.evaluate(result, budget)
+
+    result.skipped = [
+        (node.index, type(node.block).__name__) for node in nodes if node.value is None
+    ]
+    for index, name in result.skipped:
+        TEL.emit("block", name, run=result.run_id, index=index, skipped=True)
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
@@ -5,10 +5,18 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from pathlib import Path
 
+# External Modules:
+import numpy as np
+
 # Internal Modules:
 import PSE.blocks as blocks
 import PSE.image_display as ID
+import PSE.pipeline as pipeline
+import PSE.kernels as KN
+import PSE.registry as REG
 import FileHandling.image_reading as IR
+import FileHandling.chunked_format as CF
+from constants import PREVIEW_MAX_WIDTH, PREVIEW_MAX_HEIGHT
 
 
 class PSE_GUI:
@@ -23,16 +31,26 @@ class PSE_GUI:
         - `_blocks`: List of ordered user selected blocks within the PSE_GUI app.
         - `_blocks_frame`: Tkinter frame widget where the list of blocks selected
         by the user within the PSE_GUI interface is displayed.
+        - `_lazy_var`: Whether the pipeline runs in lazy mode (only blocks feeding
+        a sink or a report are executed).
+        - `_show_final_var`: Whether the final image is displayed (and therefore
+        computed in lazy mode).
+        - `_reader_cache`: Last input reader and its key (path, size, modification
+        time), keeps the image pyramid warm between previews.
 
     Private Methods:
         - `_create_sections`: Creates the base widget structure of the app.
         - `_browse_file`: Opens explorer file handler and get the selected file path.
-        - `_add_brightness_block`: Adds the brightness block to the end of the pipeline.
-        - `_add_threshold_block`: Adds the threshold block to the end of the pipeline.
-        - `_add_histogram_block`: Adds the histogram block to the end of the pipeline.
-        - `_add_convolution_block`: Adds the convolution block to the end of the pipeline.
-        - `_add_difference_block`: Adds the difference block to the end of the pipeline.
+        - `_browse_param`: Opens the file dialog of a path parameter.
+        - `_add_block`: Adds a registered block (form generated from its parameter
+        schema) to the end of the pipeline.
+        - `_add_kernel_form`: Creates the mask editor of a kernel parameter.
+        - `_save_flow`: Saves the pipeline as a JSON flow file.
+        - `_load_flow`: Replaces the pipeline with the blocks of a JSON flow file.
+        - `_read_input`: Reads (or reuses) the selected input RAW image.
         - `_process_pipeline`: Executes the constructed pipeline.
+        - `_preview_pipeline`: Executes the constructed pipeline on a reduced pyramid level.
+        - `_show_reports`: Shows the structured block reports of a pipeline run.
         - `_reset_app`: Resets all the widgets to the original configuration.
     """
 
@@ -42,6 +60,8 @@ class PSE_GUI:
         self._root = root
         self._root.title("Problem Solving Environment")
 
+        self._reader_cache:tuple[tuple, IR.RawImageReader]|None = None
+
         self._create_sections()
 
     #------------------------- Interface Sections -------------------------
@@ -89,50 +109,48 @@ class PSE_GUI:
         buttons_frame = tk.Frame(self._root)
         buttons_frame.pack(fill="x", padx=5, pady=5)
 
-        tk.Button(
-            buttons_frame,
-            text="Exibir Imagem",
-            command=self._add_display_block,
-        ).pack(side="left", padx=2)
+        # um botão por bloco registrado (PSE.registry), na ordem de registro
+        for spec in REG.block_specs():
+            tk.Button(
+                buttons_frame,
+                text=spec.button,
+                command=lambda spec=spec: self._add_block(spec),
+            ).pack(side="left", padx=2)
 
-        tk.Button(
-            buttons_frame,
-            text="Salvar .RAW",
-            command=self._add_saveraw_block,
-        ).pack(side="left", padx=2)
+        control_frame = tk.Frame(self._root)
+        control_frame.pack(padx=5, pady=5)
 
-        tk.Button(
-            buttons_frame,
-            text="Adicionar brilho",
-            command=self._add_brightness_block,
-        ).pack(side="left", padx=2)
+        self._lazy_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            control_frame,
+            text="Execução preguiçosa",
+            variable=self._lazy_var,
+        ).pack(side="left", padx=5)
 
-        tk.Button(
-            buttons_frame,
-            text="Adicionar limiarização",
-            command=self._add_threshold_block,
-        ).pack(side="left", padx=2)
+        self._show_final_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            control_frame,
+            text="Exibir imagem final",
+            variable=self._show_final_var,
+        ).pack(side="left", padx=5)
 
         tk.Button(
-            buttons_frame,
-            text="Adicionar convolução 3x3",
-            command=self._add_convolution_block,
-        ).pack(side="left", padx=2)
+            control_frame,
+            text="Abrir fluxo...",
+            command=self._load_flow
+        ).pack(side="left", padx=5)
 
         tk.Button(
-            buttons_frame,
-            text="Adicionar histograma",
-            command=self._add_histogram_block,
-        ).pack(side="left", padx=2)
+            control_frame,
+            text="Salvar fluxo...",
+            command=self._save_flow
+        ).pack(side="left", padx=5)
 
         tk.Button(
-            buttons_frame,
-            text="Adicionar diferença",
-            command=self._add_difference_block,
-        ).pack(side="left", padx=2)
-
-        control_frame = tk.Frame(self._root)
-        control_frame.pack(padx=5, pady=5)
+            control_frame,
+            text="Pré-visualizar",
+            command=self._preview_pipeline
+        ).pack(side="left", padx=5)
 
         tk.Button(
             control_frame,
@@ -155,115 +173,37 @@ class PSE_GUI:
         """
         
         path = filedialog.askopenfilename(
-            filetypes=[("RAW files", "*.raw"), ("Todos os arquivos", "*.*")]
+            filetypes=[
+                ("RAW files", "*.raw"),
+                ("Imagens em blocos", "*.psec"),
+                ("Todos os arquivos", "*.*"),
+            ]
         )
         if path:
             self._path_var.set(path)
 
-    def _add_display_block(self) -> None:
-        """
-        Adds a display block to the end of the pipeline in the blocks section of the interface.
-        Shows the current image when executed.
-        """
-
-        frame = tk.Frame(self._blocks_frame, bd=1, relief="solid", pady=2)
-        frame.pack(fill="x", padx=2, pady=2)
-
-        tk.Label(frame, text="Exibir imagem").pack(side="left")
-
-        # Título opcional da janela de exibição
-        title_var = tk.StringVar(
-            value=f"Imagem após bloco {len(self._blocks)}"
-        )
-        tk.Entry(frame, textvariable=title_var, width=30).pack(
-            side="left", padx=4
-        )
-
-        block = blocks.DisplayBlock(title_var)
-        self._blocks.append(block)
-
-    def _add_saveraw_block(self) -> None:
-        """
-        Adds a save raw block to the end of the pipeline in the blocks section of the interface.
-        Saves the current image to a .raw file.
-        """
-
-        frame = tk.Frame(self._blocks_frame, bd=1, relief="solid", pady=2)
-        frame.pack(fill="x", padx=2, pady=2)
-
-        tk.Label(frame, text="Gravar imagem RAW").pack(side="left")
-
-        file_frame = tk.Frame(frame)
-        file_frame.pack(side="left", padx=4)
-
-        path_var = tk.StringVar()
-        tk.Entry(file_frame, textvariable=path_var, width=30).pack(
-            side="left", padx=(0, 2)
-        )
-
-        def browse_save():
-            path = filedialog.asksaveasfilename(
-                defaultextension=".raw",
-                filetypes=[("RAW files", "*.raw"), ("Todos os arquivos", "*.*")],
-            )
-            if path:
-                path_var.set(path)
-
-        tk.Button(file_frame, text="...", command=browse_save, width=3).pack(
-            side="left"
-        )
-
-        block = blocks.SaveRawBlock(path_var)
-        self._blocks.append(block)
-
-    def _add_brightness_block(self) -> None:
-        """
-        Adds a brightness block to the end of the pipeline in the blocks section of the interface.
-        """
-
-        frame = tk.Frame(self._blocks_frame, bd=1, relief="solid", pady=2)
-        frame.pack(fill="x", padx=2, pady=2)
-
-        tk.Label(frame, text="Brilho Δ:").pack(side="left")
-        delta_var = tk.StringVar(value="0")
-        tk.Entry(frame, textvariable=delta_var, width=8).pack(side="left")
-
-        block = blocks.BrightnessBlock(delta_var)
-        self._blocks.append(block)
-
-    def _add_threshold_block(self) -> None:
+    def _browse_param(self, param:REG.ParamSpec, variable:tk.StringVar) -> None:
         """
-        Adds a treshold block to the end of the pipeline in the blocks section of the interface.
+        Opens the file dialog of a path parameter and stores the chosen path.
         """
-        frame = tk.Frame(self._blocks_frame, bd=1, relief="solid", pady=2)
-        frame.pack(fill="x", padx=2, pady=2)
-
-        tk.Label(frame, text="Limiar T:").pack(side="left")
-        t_var = tk.StringVar(value="128")
-        tk.Entry(frame, textvariable=t_var, width=8).pack(side="left")
-
-        block = blocks.ThresholdBlock(t_var)
-        self._blocks.append(block)
-
-    def _add_histogram_block(self):
-        """
-        Adds a histogram block to the end of the pipeline in the blocks section of the interface.
-        """
-        frame = tk.Frame(self._blocks_frame, bd=1, relief="solid", pady=2)
-        frame.pack(fill="x", padx=2, pady=2)
-
-        tk.Label(frame, text="Histograma").pack(side="left")
 
-        block = blocks.HistogramBlock()
-        self._blocks.append(block)
+        filetypes = list(param.filetypes) or [("Todos os arquivos", "*.*")]
+        if param.kind == "save_path":
+            path = filedialog.asksaveasfilename(defaultextension=param.extension, filetypes=filetypes)
+        else:
+            path = filedialog.askopenfilename(filetypes=filetypes)
+        if path:
+            variable.set(path)
 
-    def _add_convolution_block(self) -> None:
+    def _add_block(self, spec:REG.BlockSpec, params:dict|None=None) -> None:
         """
-        Adds a convolution block to the end of the pipeline in the blocks section
-        of the interface.
+        Adds a block to the end of the pipeline in the blocks section of the
+        interface, with a form generated from its registered parameters.
 
-        - Allows the user to choose the size of the mask (3x3, 5x5, 7x7, 9x9).
-        - Include preset masks: Avarege, Laplaciano (4 / 8 neighbours).
+        Parameters:
+            - spec: Registered block definition.
+            - params: Optional -> Initial parameter values (JSON values, e.g.
+            from a loaded flow file); missing ones take their default.
         """
 
         frame = tk.Frame(self._blocks_frame, bd=1, relief="solid", pady=2)
@@ -271,231 +211,308 @@ class PSE_GUI:
 
         header_frame = tk.Frame(frame)
         header_frame.pack(fill="x")
+        tk.Label(header_frame, text=spec.label).pack(side="left")
+
+        params = params or {}
+        variables = {}
+        for param in spec.params:
+            value = params.get(param.name, param.default_for(len(self._blocks)))
+
+            if param.kind == "kernel":
+                variables[param.name] = self._add_kernel_form(frame, header_frame, param, value)
+                continue
+
+            if param.label:
+                tk.Label(header_frame, text=f"  {param.label}:").pack(side="left")
+
+            variable = tk.StringVar(value=param.to_text(value))
+            if param.kind == "choice":
+                tk.OptionMenu(header_frame, variable, *param.choices).pack(side="left")
+            else:
+                tk.Entry(header_frame, textvariable=variable, width=param.width).pack(side="left", padx=2)
+
+            if param.kind in ("open_path", "save_path"):
+                tk.Button(
+                    header_frame,
+                    text="...",
+                    command=lambda param=param, variable=variable: self._browse_param(param, variable),
+                    width=3,
+                ).pack(side="left")
+
+            variables[param.name] = variable
+
+        self._blocks.append(REG.create_block(spec, variables))
+
+    def _add_kernel_form(
+        self,
+        frame:tk.Frame,
+        header_frame:tk.Frame,
+        param:REG.ParamSpec,
+        value:list[list]|None,
+    ) -> list[list[tk.Entry]]:
+        """
+        Creates the mask editor of a "kernel" parameter: size spin box (odd
+        sizes up to `param.max_size`), preset masks (Média, Laplaciano 4 / 8
+        vizinhos) and the grid of cells.
 
-        tk.Label(header_frame, text="Convolução local").pack(side="left")
+        Return:
+            The grid of entries. The same list object is refilled in place when
+            the size changes, so the block always reads the current grid.
+        """
 
         tk.Label(header_frame, text="  Tamanho:").pack(side="left", padx=(10, 2))
-        size_var = tk.StringVar(value="3")
-        size_spin = tk.Spinbox(
+        size_var = tk.StringVar(value=str(len(value)) if value else "3")
+        tk.Spinbox(
             header_frame,
             from_=1,
-            to=9,
+            to=param.max_size,
             increment=2,          # 1, 3, 5, 7, 9...
             width=4,
             textvariable=size_var,
-        )
-        size_spin.pack(side="left")
+        ).pack(side="left")
 
-        tk.Label(header_frame, text="  Máscara:").pack(side="left", padx=(10, 2))
+        tk.Label(header_frame, text=f"  {param.label}:").pack(side="left", padx=(10, 2))
         preset_var = tk.StringVar(value="Personalizada")
-        preset_menu = tk.OptionMenu(
-            header_frame,
-            preset_var,
-            "Personalizada",
-            "Média",
-            "Laplaciano (4-vizinhos)",
-            "Laplaciano (8-vizinhos)",
-        )
-        preset_menu.pack(side="left")
+        tk.OptionMenu(header_frame, preset_var, "Personalizada", *KN.PRESETS).pack(side="left")
 
         grid_frame = tk.Frame(frame)
         grid_frame.pack(pady=2)
 
-        entries_matrix: list[list[tk.Entry]] = []
-
-        conv_block = blocks.ConvolutionBlock(size_var, entries_matrix)
-        self._blocks.append(conv_block)
+        entries_matrix:list[list[tk.Entry]] = []
 
-        def build_grid(*_args):
+        def build_grid(cells:list[list]|None=None) -> None:
             """
             (Re)construct the input grid given choosen size.
             """
-            nonlocal entries_matrix
 
             # Clears previous grid:
             for child in grid_frame.winfo_children():
                 child.destroy()
-            entries_matrix = []
 
             try:
                 n = int(size_var.get())
             except ValueError:
                 n = 3
+            n = max(1, n)
 
-            if n < 1:
-                n = 1
-
+            rows:list[list[tk.Entry]] = []
             for i in range(n):
-                row: list[tk.Entry] = []
+                row:list[tk.Entry] = []
                 for j in range(n):
                     e = tk.Entry(grid_frame, width=4)
                     e.grid(row=i, column=j, padx=1, pady=1)
-                    e.insert(0, "0")
+                    e.insert(0, str(cells[i][j]) if cells else "0")
                     row.append(e)
-                entries_matrix.append(row)
+                rows.append(row)
 
-            conv_block.set_entries_matrix(entries_matrix)
+            entries_matrix[:] = rows
 
-        def apply_preset(*_args):
+        def apply_preset() -> None:
             """
             Fills any grid size (n > 1) with implemented presets.
             """
-            nonlocal entries_matrix
-            preset = preset_var.get()
-
-            if not entries_matrix:
-                return
-
-            n = len(entries_matrix)
 
-            for row in entries_matrix:
-                if len(row) != n:
-                    return
-
-            if preset == "Personalizada":
-                return
-
-            if preset == "Média":
-                value = 1.0 / (n * n)
-                for i in range(n):
-                    for j in range(n):
-                        e = entries_matrix[i][j]
-                        e.delete(0, tk.END)
-                        e.insert(0, f"{value:.4f}")
+            preset = preset_var.get()
+            if not entries_matrix or preset == "Personalizada":
                 return
 
-            if n < 3:
+            kernel = KN.preset_kernel(preset, len(entries_matrix))
+            if kernel is None:
                 return
 
-            for i in range(n):
-                for j in range(n):
-                    e = entries_matrix[i][j]
+            for row, values in zip(entries_matrix, kernel.values):
+                for e, weight in zip(row, values):
                     e.delete(0, tk.END)
-                    e.insert(0, "0")
-
-            c = n // 2
-
-            if preset == "Laplaciano (4-vizinhos)":
-                entries_matrix[c][c].delete(0, tk.END)
-                entries_matrix[c][c].insert(0, "4")
-
-                coords = [
-                    (c - 1, c),
-                    (c + 1, c),
-                    (c, c - 1),
-                    (c, c + 1),
-                ]
-                for i, j in coords:
-                    if 0 <= i < n and 0 <= j < n:
-                        e = entries_matrix[i][j]
-                        e.delete(0, tk.END)
-                        e.insert(0, "-1")
-
-            elif preset == "Laplaciano (8-vizinhos)":
-                for di in (-1, 0, 1):
-                    for dj in (-1, 0, 1):
-                        i = c + di
-                        j = c + dj
-                        if 0 <= i < n and 0 <= j < n:
-                            e = entries_matrix[i][j]
-                            e.delete(0, tk.END)
-                            if di == 0 and dj == 0:
-                                e.insert(0, "8")
-                            else:
-                                e.insert(0, "-1")
-
-        build_grid()
+                    e.insert(0, KN.format_weight(weight))
+
+        square = value and all(len(row) == len(value) for row in value)
+        build_grid(value if square else None)
 
         size_var.trace_add("write", lambda *args: build_grid())
         preset_var.trace_add("write", lambda *args: apply_preset())
 
-    def _add_difference_block(self) -> None:
+        return entries_matrix
+
+    def _save_flow(self) -> None:
         """
-        Adds a difference block to the end of the pipeline.
-        A diferença é feita entre a imagem atual do pipeline
-        e uma outra imagem RAW escolhida no próprio bloco.
+        Saves the current pipeline as a JSON flow file (same format used by the
+        pipeline server, the streaming mode and the headless runner).
         """
 
-        frame = tk.Frame(self._blocks_frame, bd=1, relief="solid", pady=2)
-        frame.pack(fill="x", padx=2, pady=2)
-
-        # título do bloco
-        tk.Label(frame, text="Diferença com outra imagem RAW").pack(
-            side="top", anchor="w"
+        path = filedialog.asksaveasfilename(
+            defaultextension=REG.FLOW_FILE_EXTENSION,
+            filetypes=[("Fluxos JSON", "*.json"), ("Todos os arquivos", "*.*")],
         )
+        if not path:
+            return
 
-        # linha de seleção de arquivo
-        file_frame = tk.Frame(frame)
-        file_frame.pack(fill="x", pady=1)
-
-        tk.Label(file_frame, text="Arquivo:").pack(side="left")
-
-        path_var = tk.StringVar()
-        tk.Entry(file_frame, textvariable=path_var, width=30).pack(
-            side="left", padx=2
-        )
+        try:
+            REG.save_flow(path, self._blocks)
+        except Exception as e:
+            messagebox.showerror("Erro ao salvar fluxo", str(e))
 
-        def browse_other_file():
-            path = filedialog.askopenfilename(
-                filetypes=[("RAW files", "*.raw"), ("Todos os arquivos", "*.*")]
-            )
-            if path:
-                path_var.set(path)
+    def _load_flow(self) -> None:
+        """
+        Replaces the current pipeline with the blocks of a JSON flow file.
+        """
 
-        tk.Button(file_frame, text="Procurar...", command=browse_other_file).pack(
-            side="left", padx=2
+        path = filedialog.askopenfilename(
+            filetypes=[("Fluxos JSON", "*.json"), ("Todos os arquivos", "*.*")],
         )
+        if not path:
+            return
 
-        # linha de largura/altura
-        size_frame = tk.Frame(frame)
-        size_frame.pack(fill="x", pady=1)
-
-        tk.Label(size_frame, text="Largura:").pack(side="left")
-        width_var = tk.StringVar()
-        tk.Entry(size_frame, textvariable=width_var, width=6).pack(
-            side="left", padx=2
-        )
+        try:
+            flow = REG.load_flow(path)
+        except Exception as e:
+            messagebox.showerror("Erro ao abrir fluxo", str(e))
+            return
 
-        tk.Label(size_frame, text="Altura:").pack(side="left")
-        height_var = tk.StringVar()
-        tk.Entry(size_frame, textvariable=height_var, width=6).pack(
-            side="left", padx=2
-        )
+        for child in self._blocks_frame.winfo_children():
+            child.destroy()
+        self._blocks.clear()
 
-        # cria o bloco lógico e adiciona na lista do pipeline
-        block = blocks.DifferenceBlock(path_var, width_var, height_var)
-        self._blocks.append(block)
+        for item in flow:
+            self._add_block(REG.block_spec(item["block"]), item.get("params", {}))
 
-    def _process_pipeline(self):
+    def _read_input(self) -> IR.RawImageReader|None:
         """
-        Executes the pipeline created by the user in the interface, the execution order is top to bottom.
+        Reads the selected input image (RAW, or .psec chunked file), reusing the previous reader (and its
+        cached pyramid) while path, dimensions and modification time are the same.
+        Shows an error message and returns `None` on failure.
         """
-        
+
         file_path = self._path_var.get()
         if not file_path:
             messagebox.showerror("Erro", "Selecione um arquivo .RAW!")
-            return
+            return None
         file_path = Path(file_path)
 
-        try:
-            width = int(self._width_var.get())
-            height = int(self._height_var.get())
-        except ValueError:
-            messagebox.showerror("Erro", "Largura e/ou altura inválidas!")
-            return
+        if file_path.suffix.lower() == CF.FILE_EXTENSION:
+            # dimensões vêm do cabeçalho do arquivo em blocos
+            width = height = None
+        else:
+            try:
+                width = int(self._width_var.get())
+                height = int(self._height_var.get())
+            except ValueError:
+                messagebox.showerror("Erro", "Largura e/ou altura inválidas!")
+                return None
 
         try:
-            reader = IR.RawImageReader(file_path, width, height)
+            key = (str(file_path), width, height, file_path.stat().st_mtime_ns)
+            if self._reader_cache is None or self._reader_cache[0] != key:
+                self._reader_cache = (key, IR.open_image(file_path, width, height))
         except Exception as e:
             messagebox.showerror("Erro ao ler RAW", str(e))
+            return None
+
+        return self._reader_cache[1]
+
+    def _preview_pipeline(self) -> None:
+        """
+        Executes the pipeline on the first pyramid level that fits the preview
+        size, for quick parameter tuning. Blocks adapt their parameters to the
+        level and RAW saving blocks are not executed.
+        """
+
+        reader = self._read_input()
+        if reader is None:
+            return
+
+        level = reader.level_for_size(PREVIEW_MAX_WIDTH, PREVIEW_MAX_HEIGHT)
+        image = reader.level(level)
+        height, width = image.shape
+
+        ID.display(image, f"Prévia inicial ({width}x{height}):")
+        try:
+            result = pipeline.run_pipeline(
+                image,
+                self._blocks,
+                lazy=self._lazy_var.get(),
+                keep_output=True,
+                level=level,
+            )
+        except ValueError as e:
+            # e.g. célula inválida na máscara, com linha e coluna na mensagem
+            messagebox.showerror("Erro no fluxo", str(e))
+            return
+        except MemoryError as e:
+            # bloco que não cabe no orçamento de memória (PSE/memory.py plan_block)
+            messagebox.showerror("Memória insuficiente", str(e))
             return
+        self._show_reports(result)
+        ID.display(result.image, f"Prévia final ({width}x{height}):")
 
+    def _process_pipeline(self):
+        """
+        Executes the pipeline created by the user in the interface, the execution order is top to bottom.
+        """
+
+        reader = self._read_input()
+        if reader is None:
+            return
+
+        show_final = self._show_final_var.get()
+
+        ID.display(reader.image, "Imagem Inicial:")
+        try:
+            result = pipeline.run_pipeline(
+                reader.image,
+                self._blocks,
+                lazy=self._lazy_var.get(),
+                keep_output=show_final,
+            )
+        except ValueError as e:
+            messagebox.showerror("Erro no fluxo", str(e))
+            return
+        except MemoryError as e:
+            messagebox.showerror("Memória insuficiente", str(e))
+            return
+        self._show_reports(result)
+        if show_final:
+            ID.display(result.image, "Imagem Final:")
+
+    def _show_reports(self, result:pipeline.PipelineResult, max_rows:int=500) -> None:
+        """
+        Shows the structured reports of a pipeline run (e.g. region tables) in
+        a new window. Does nothing when no block produced a report.
+
+        Parameters:
+            - result: The pipeline run result.
+            - max_rows: Optional -> Maximum number of table rows shown per report.
+        """
+
+        if not result.reports:
+            return
 
-        current = reader.image
-        ID.display(current, "Imagem Inicial:")
-        for block in self._blocks:
-            current = block.apply(current)
-        ID.display(current, "Imagem Final:")
+        window = tk.Toplevel(self._root)
+        window.title("Relatórios do fluxo")
+
+        text = tk.Text(window, width=100, height=30, font=("Courier", 9))
+        scroll = tk.Scrollbar(window, command=text.yview)
+        text.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+        text.pack(side="left", fill="both", expand=True)
+
+        for index, name, report in result.reports:
+            text.insert(tk.END, f"Bloco {index} ({name})\n")
+            for key, value in report.items():
+                if isinstance(value, np.ndarray) and value.dtype.names:
+                    names = value.dtype.names
+                    text.insert(tk.END, "  " + "".join(f"{n:>10}" for n in names) + "\n")
+                    for row in value[:max_rows]:
+                        cells = (f"{v:>10.2f}" if isinstance(v, float) else f"{v:>10}" for v in row.tolist())
+                        text.insert(tk.END, "  " + "".join(cells) + "\n")
+                    if len(value) > max_rows:
+                        text.insert(tk.END, f"  ... ({len(value) - max_rows} linhas omitidas)\n")
+                elif isinstance(value, np.ndarray):
+                    text.insert(tk.END, f"  {key}: matriz {value.shape} {value.dtype}\n")
+                else:
+                    text.insert(tk.END, f"  {key}: {value}\n")
+            text.insert(tk.END, "\n")
+
+        text.configure(state="disabled")
 
     def _reset_app(self) -> None:
         """
@@ -0,0 +1,93 @@
+"""
+Multi-resolution image pyramid helpers (Gaussian or mean), 8-bit grayscale.
+
+* Level 0 is the full resolution image, each following level halves both
+dimensions (rounding up).
+* The Gaussian level uses the separable 5-tap binomial mask [1 4 6 4 1] / 16
+computed with integer arithmetic, so the result is exact and reproducible.
+"""
+
+# External Modules:
+import numpy as np
+
+
+PYRAMID_MODES:tuple[str, ...] = ("gaussian", "mean")
+
+
+def downsample(image:np.ndarray, mode:str="gaussian") -> np.ndarray:
+    """
+    Returns the next (half resolution) pyramid level of `image`.
+
+    Parameters:
+        - image: 2D uint8 image.
+        - mode: Optional -> "gaussian" (binomial 5x5 blur + decimation) or
+        "mean" (2x2 block average).
+
+    Return:
+        uint8 image with shape (ceil(h / 2), ceil(w / 2)).
+    """
+
+    h, w = image.shape
+
+    if mode == "mean":
+        # replica a última linha/coluna quando a dimensão é ímpar
+        padded = np.pad(image, ((0, h % 2), (0, w % 2)), mode="edge").astype(np.uint16)
+        total = padded[0::2, 0::2] + padded[1::2, 0::2] + padded[0::2, 1::2] + padded[1::2, 1::2]
+        return ((total + 2) >> 2).astype(np.uint8)
+
+    if mode != "gaussian":
+        raise ValueError(f"Unknown pyramid mode: {mode}")
+
+    # só as linhas/colunas pares são mantidas, então o filtro vertical é
+    # aplicado apenas nelas (máximo 16 * 16 * 255 = 65280 cabe em uint16)
+    padded = np.pad(image, 2, mode="reflect").astype(np.uint16)
+    rows = (
+        padded[0:h:2] + 4 * padded[1:h + 1:2] + 6 * padded[2:h + 2:2]
+        + 4 * padded[3:h + 3:2] + padded[4:h + 4:2]
+    )
+    total = (
+        rows[:, 0:w:2] + 4 * rows[:, 1:w + 1:2] + 6 * rows[:, 2:w + 2:2]
+        + 4 * rows[:, 3:w + 3:2] + rows[:, 4:w + 4:2]
+    )
+    return ((total + 128) >> 8).astype(np.uint8)
+
+
+def build_pyramid(image:np.ndarray, levels:int, mode:str="gaussian") -> list[np.ndarray]:
+    """
+    Builds a pyramid with `levels` reduced levels on top of `image`.
+
+    Stops early when a level would be smaller than 1 pixel in any dimension.
+
+    Return:
+        List of images, position 0 being `image` itself.
+    """
+
+    pyramid = [image]
+    for _ in range(levels):
+        if min(pyramid[-1].shape) < 2:
+            break
+        pyramid.append(downsample(pyramid[-1], mode))
+    return pyramid
+
+
+def level_for_size(width:int, height:int, max_width:int, max_height:int) -> int:
+    """
+    Returns the first pyramid level whose dimensions fit in
+    (`max_width`, `max_height`), capped at the deepest level that can be built
+    (a level whose smaller dimension is below 2 is not downsampled further,
+    see `RawImageReader.level`).
+    """
+
+    level = 0
+    while width > max_width or height > max_height:
+        if min(width, height) < 2:
+            break
+        width = (width + 1) // 2
+        height = (height + 1) // 2
+        level += 1
+    return level
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
@@ -0,0 +1,445 @@
+"""
+Block registry: one declarative definition per block type.
+
+* A `BlockSpec` declares the flow name, the GUI texts, the parameter schema
+(`ParamSpec` list) and the factory of a block. The GUI form, the JSON flow
+format (server, streaming, headless runner) and the flow files saved by the
+GUI are all generated from it, so a new block only needs a class and a
+`register_block` call.
+* Operations with more than one implementation (e.g. a numpy and an optional
+compiled backend) register them with `register_implementation`; the fastest
+available one that has the required capabilities is picked at runtime.
+
+Only the standard library and numpy (for `jsonable_report`) are imported
+here, so blocks.py can register its specs on import.
+"""
+
+# Native Modules:
+import json
+from pathlib import Path
+from typing import Callable
+
+# External Modules:
+import numpy as np
+
+
+PARAM_KINDS:tuple[str, ...] = ("int", "float", "text", "choice", "open_path", "save_path", "kernel")
+
+FLOW_FILE_EXTENSION:str = ".json"
+
+
+class ConstVar:
+    """
+    Substituto somente leitura de `tk.StringVar`, para montar blocos sem GUI
+    (servidor, scripts). Só implementa `get`.
+    """
+
+    def __init__(self, value) -> None:
+        self._value = str(value)
+
+    def get(self) -> str:
+        return self._value
+
+
+class ParamSpec:
+    """
+    Declared parameter of a block.
+
+    Attributes:
+        - `name`: Key in the flow "params" object and factory keyword.
+        - `label`: GUI label ("" for none).
+        - `kind`: One of `PARAM_KINDS`. Every kind but "kernel" is edited as
+        a text variable; "kernel" is a square grid of cells.
+        - `default`: JSON value used when the parameter is missing, `None` for
+        required parameters. "{index}" in a text default is replaced by the
+        block position.
+        - `choices`: Options of a "choice" parameter.
+        - `width`: GUI entry width.
+        - `filetypes` / `extension`: File dialog filters and default extension
+        of path parameters.
+        - `max_size`: Largest mask size of a "kernel" parameter.
+    """
+
+    def __init__(
+        self,
+        name:str,
+        label:str="",
+        kind:str="text",
+        default=None,
+        choices:tuple[str, ...]=(),
+        width:int=8,
+        filetypes:tuple[tuple[str, str], ...]=(),
+        extension:str="",
+        max_size:int=9,
+    ) -> None:
+        if kind not in PARAM_KINDS:
+            raise ValueError(f"Unknown parameter kind: {kind}")
+        if kind == "choice" and not choices:
+            raise ValueError(f"Choice parameter without choices: {name}")
+
+        self.name       = name
+        self.label      = label
+        self.kind       = kind
+        self.default    = default
+        self.choices    = tuple(choices)
+        self.width      = width
+        self.filetypes  = tuple(filetypes)
+        self.extension  = extension
+        self.max_size   = max_size
+
+    def default_for(self, index:int):
+        """Default JSON value for the block at position `index` of a flow."""
+
+        if isinstance(self.default, str):
+            return self.default.replace("{index}", str(index))
+        return self.default
+
+    def to_text(self, value) -> str:
+        """Text shown in the GUI for a JSON value (not for "kernel" parameters)."""
+
+        return "" if value is None else str(value)
+
+    def to_json(self, variable):
+        """
+        JSON value of a parameter variable: numbers for "int"/"float" (the raw
+        text when it does not parse, so the block applies its own fallback), a
+        list of rows of cell strings for "kernel", the text otherwise.
+        """
+
+        if self.kind == "kernel":
+            return [[cell.get() for cell in row] for row in variable]
+
+        text = variable.get()
+        if self.kind in ("int", "float"):
+            try:
+                return int(text) if self.kind == "int" else float(text)
+            except ValueError:
+                return text
+        return text
+
+    def headless_variable(self, value):
+        """Read-only variable (or grid of cells) holding a JSON value."""
+
+        if self.kind == "kernel":
+            if not isinstance(value, (list, tuple)) or not all(isinstance(row, (list, tuple)) for row in value):
+                raise ValueError(f"Parâmetro '{self.name}' deve ser uma matriz (lista de linhas).")
+            return [[ConstVar(cell) for cell in row] for row in value]
+        return ConstVar(self.to_text(value))
+
+
+class BlockSpec:
+    """
+    Declared block type.
+
+    Attributes:
+        - `name`: Flow name (e.g. "threshold").
+        - `label`: Title of the block in the GUI pipeline.
+        - `button`: Text of the GUI button that adds the block.
+        - `factory`: Callable receiving one keyword per parameter (variables)
+        and returning the `Block`.
+        - `params`: Tuple of `ParamSpec`.
+        - `headless`: Whether the block can run without a GUI (server,
+        streaming, scripts); display and plot blocks cannot.
+    """
+
+    def __init__(
+        self,
+        name:str,
+        label:str,
+        factory:Callable,
+        params:tuple[ParamSpec, ...]=(),
+        button:str|None=None,
+        headless:bool=True,
+    ) -> None:
+        self.name       = name
+        self.label      = label
+        self.factory    = factory
+        self.params     = tuple(params)
+        self.button     = button or label
+        self.headless   = headless
+
+    def param(self, name:str) -> ParamSpec:
+        for param in self.params:
+            if param.name == name:
+                return param
+        raise KeyError(name)
+
+
+class Implementation:
+    """
+    One implementation of an operation.
+
+    Attributes:
+        - `op` / `name`: Operation and implementation names.
+        - `function`: The callable.
+        - `priority`: Higher priorities are preferred.
+        - `capabilities`: Frozen set of capability tags.
+    """
+
+    def __init__(
+        self,
+        op:str,
+        name:str,
+        function:Callable,
+        priority:int=0,
+        available:Callable[[], bool]|None=None,
+        capabilities:tuple[str, ...]=(),
+    ) -> None:
+        self.op             = op
+        self.name           = name
+        self.function       = function
+        self.priority       = priority
+        self.capabilities   = frozenset(capabilities)
+        self._available     = available
+        self._is_available:bool|None = None
+
+    @property
+    def available(self) -> bool:
+        """Whether the implementation can run here (checked once)."""
+
+        if self._is_available is None:
+            try:
+                self._is_available = bool(self._available()) if self._available is not None else True
+            except Exception:
+                self._is_available = False
+        return self._is_available
+
+
+_blocks:dict[str, BlockSpec]                    = {}
+_implementations:dict[str, list[Implementation]] = {}
+_preferred:dict[str, str]                       = {}
+_selected:dict[tuple, Implementation]           = {}
+
+
+#------------------------------- Blocks -------------------------------
+def register_block(spec:BlockSpec) -> BlockSpec:
+    """Registers `spec` (GUI buttons follow the registration order)."""
+
+    if spec.name in _blocks:
+        raise ValueError(f"Block already registered: {spec.name}")
+    _blocks[spec.name] = spec
+    return spec
+
+
+def block_spec(name:str) -> BlockSpec:
+    """Returns the registered spec called `name`."""
+
+    spec = _blocks.get(name)
+    if spec is None:
+        raise ValueError(f"Bloco desconhecido: {name!r}")
+    return spec
+
+
+def block_specs() -> tuple[BlockSpec, ...]:
+    """Every registered spec, in registration order."""
+
+    return tuple(_blocks.values())
+
+
+def create_block(spec:BlockSpec, variables:dict):
+    """
+    Creates a block from its parameter variables (GUI `tk.StringVar`s, entry
+    grids or `ConstVar`s) and binds it to `spec`, so it can be serialized back
+    with `block_params`.
+    """
+
+    block = spec.factory(**variables)
+    block.spec = spec
+    block.variables = variables
+    return block
+
+
+def build_block(name:str, params:dict|None=None, headless:bool=True):
+    """
+    Builds a block from its JSON parameters.
+
+    Parameters:
+        - name: Registered block name.
+        - params: Optional -> {parameter name: JSON value}; missing parameters
+        take their default.
+        - headless: Optional -> Rejects blocks that need a GUI.
+    """
+
+    spec = block_spec(name)
+    if headless and not spec.headless:
+        raise ValueError(f"Bloco {name!r} não pode ser executado sem interface gráfica.")
+
+    params = params or {}
+    unknown = set(params) - {p.name for p in spec.params}
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos no bloco {name!r}: {', '.join(sorted(unknown))}")
+
+    variables = {}
+    for param in spec.params:
+        value = params.get(param.name, param.default_for(0))
+        if value is None:
+            raise ValueError(f"Parâmetro obrigatório ausente no bloco {name!r}: {param.name}")
+        variables[param.name] = param.headless_variable(value)
+
+    return create_block(spec, variables)
+
+
+def build_flow(flow:list[dict], headless:bool=True) -> list:
+    """
+    Builds the block chain described by `flow`.
+
+    Parameters:
+        - flow: List of {"block": name, "params": {...}} objects.
+        - headless: Optional -> See `build_block`.
+
+    Return:
+        The ordered list of blocks.
+    """
+
+    if not isinstance(flow, list):
+        raise ValueError("O fluxo deve ser uma lista de blocos.")
+    return [build_block(item.get("block"), item.get("params", {}), headless) for item in flow]
+
+
+def block_params(block) -> dict:
+    """JSON parameters of a block created through the registry."""
+
+    spec = getattr(block, "spec", None)
+    if spec is None:
+        raise ValueError(f"Bloco {type(block).__name__} não foi criado pelo registro.")
+    return {param.name: param.to_json(block.variables[param.name]) for param in spec.params}
+
+
+def to_flow(block_list:list) -> list[dict]:
+    """JSON flow description of `block_list`."""
+
+    return [{"block": block.spec.name, "params": block_params(block)} for block in block_list]
+
+
+def save_flow(file_path:str|Path, block_list:list) -> None:
+    """Saves the JSON flow of `block_list` to `file_path`."""
+
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(json.dumps(to_flow(block_list), ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def load_flow(file_path:str|Path) -> list[dict]:
+    """
+    Reads a JSON flow file and checks every block name (parameters are
+    checked when the blocks are built).
+    """
+
+    flow = json.loads(Path(file_path).read_text(encoding="utf-8"))
+    if not isinstance(flow, list) or not all(isinstance(item, dict) for item in flow):
+        raise ValueError("O fluxo deve ser uma lista de objetos {\"block\": ..., \"params\": {...}}.")
+    for item in flow:
+        block_spec(item.get("block"))
+    return flow
+
+
+def jsonable_report(report:dict) -> dict:
+    """
+    JSON-friendly copy of a block report: structured arrays become lists of
+    records and other arrays (e.g. label images) are left out.
+    """
+
+    out = {}
+    for key, value in report.items():
+        if isinstance(value, np.ndarray):
+            if value.dtype.names:
+                out[key] = [dict(zip(value.dtype.names, row)) for row in value.tolist()]
+        else:
+            out[key] = value
+    return out
+#----------------------------------------------------------------------
+
+
+#--------------------------- Implementations --------------------------
+def register_implementation(
+    op:str,
+    name:str,
+    function:Callable,
+    priority:int=0,
+    available:Callable[[], bool]|None=None,
+    capabilities:tuple[str, ...]=(),
+) -> Implementation:
+    """
+    Registers an implementation of operation `op`.
+
+    Parameters:
+        - op: Operation name (e.g. "correlate").
+        - name: Implementation name (e.g. "numpy").
+        - function: The callable; every implementation of an operation must
+        take the same arguments and return identical results.
+        - priority: Optional -> Higher priorities are preferred.
+        - available: Optional -> Callable telling whether the implementation
+        can run here (e.g. an optional dependency is installed).
+        - capabilities: Optional -> Tags matched by `select_implementation`.
+    """
+
+    impl = Implementation(op, name, function, priority, available, capabilities)
+    impls = [i for i in _implementations.get(op, []) if i.name != name] + [impl]
+    _implementations[op] = sorted(impls, key=lambda i: -i.priority)
+    _selected.clear()
+    return impl
+
+
+def implementations(op:str) -> tuple[Implementation, ...]:
+    """Registered implementations of `op`, highest priority first."""
+
+    return tuple(_implementations.get(op, ()))
+
+
+def set_preferred(op:str, name:str|None) -> None:
+    """
+    Forces implementation `name` of `op` whenever it is available (`None`
+    restores the priority order).
+    """
+
+    if name is None:
+        _preferred.pop(op, None)
+    else:
+        _preferred[op] = name
+    _selected.clear()
+
+
+def warm_up(ops:tuple[str, ...]|None=None) -> None:
+    """
+    Selects the implementation of every operation in `ops` (default: all),
+    so the availability checks (e.g. importing numba and loading its compiled
+    kernels) run now instead of inside the first block that needs them. Call
+    it when a long-lived runner (server, stream) starts.
+    """
+
+    for op in (tuple(_implementations) if ops is None else ops):
+        try:
+            select_implementation(op)
+        except LookupError:
+            pass
+
+
+def select_implementation(op:str, require:tuple[str, ...]=()) -> Implementation:
+    """
+    Returns the implementation of `op` to use: the preferred one (see
+    `set_preferred`) if available, otherwise the highest priority available
+    implementation having every capability in `require`. Implementations
+    lacking a required capability are not checked for availability (so an
+    optional backend is not imported for work it cannot do).
+    """
+
+    key = (op, tuple(require))
+    impl = _selected.get(key)
+    if impl is not None:
+        return impl
+
+    required = frozenset(require)
+    candidates = [i for i in _implementations.get(op, ()) if required <= i.capabilities and i.available]
+    if not candidates:
+        raise LookupError(f"No available implementation of {op!r} with {sorted(required)}")
+
+    preferred = [i for i in candidates if i.name == _preferred.get(op)]
+    impl = (preferred or candidates)[0]
+    _selected[key] = impl
+    return impl
+#----------------------------------------------------------------------
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
@@ -0,0 +1,360 @@
+"""
+Long-lived local pipeline server (Unix socket + shared memory).
+
+The server process imports everything once and keeps compiled pipelines
+(block chains built from a flow description), attached shared-memory
+segments and block caches (e.g. `DifferenceBlock` reference images) warm
+between requests. Clients write the 8-bit frame into a shared-memory segment,
+send a one-line JSON request and get the result written back into the same
+segment, so pixels never travel through the socket.
+
+Protocol (one JSON object per line, both directions):
+    {"op": "ping"}
+    {"op": "run", "flow": [...], "shm": name, "width": w, "height": h, "lazy": false}
+    {"op": "release", "shm": name}
+    {"op": "stats"}
+    {"op": "shutdown"}
+
+A flow is a list of {"block": <name>, "params": {...}} objects, see the
+blocks registered in `PSE.registry` (those with `headless=True`).
+"""
+
+# Native Modules:
+import json
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+# Internal Modules:
+import PSE.blocks as blocks
+import PSE.pipeline as pipeline
+import PSE.registry as REG
+from constants import PIPELINE_SOCKET_PATH
+
+# External Modules:
+import numpy as np
+
+
+_PIPELINE_CACHE_SIZE:int    = 32    # Maximum number of compiled pipelines kept by the server.
+_SHM_CACHE_SIZE:int         = 16    # Maximum number of shared-memory segments kept attached.
+
+
+def _attach_shm(name:str) -> shared_memory.SharedMemory:
+    """Attaches to an existing segment without letting this process unlink it at exit."""
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: no `track` argument, unregister by hand.
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _remove_stale_socket(socket_path:Path) -> None:
+    """
+    Removes a socket file left by a server that is no longer running; a live
+    server (one that accepts the connection) is left untouched.
+    """
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except ConnectionRefusedError:
+        socket_path.unlink(missing_ok=True)
+        return
+    except FileNotFoundError:
+        return
+    finally:
+        probe.close()
+
+    raise RuntimeError(f"A pipeline server is already listening on {socket_path}")
+
+
+class PipelineServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Pipeline server bound to a Unix socket.
+
+    Private Attributes:
+        - `_pipelines`: LRU cache of compiled pipelines keyed by the canonical flow JSON.
+        - `_segments`: LRU cache of attached shared-memory segments keyed by name.
+        - `_run_lock`: Serializes pipeline runs (blocks hold per-instance caches).
+        - `_stats`: Request counters.
+
+    Methods:
+        - `run_request`: Runs a flow over a shared-memory frame, in place.
+        - `release_segment`: Detaches a shared-memory segment.
+        - `stats`: Returns the server counters.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path:str|Path=PIPELINE_SOCKET_PATH) -> None:
+        """
+        Creates the server and binds it to `socket_path` (a stale socket file
+        is removed first).
+
+        Raises:
+            RuntimeError if another server is already listening on `socket_path`.
+        """
+
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Unix sockets are not supported on this platform.")
+
+        self.socket_path = Path(socket_path)
+        if self.socket_path.exists():
+            _remove_stale_socket(self.socket_path)
+
+        self._pipelines:OrderedDict[str, list[blocks.Block]]            = OrderedDict()
+        self._segments:OrderedDict[str, shared_memory.SharedMemory]     = OrderedDict()
+        self._run_lock = threading.Lock()
+        self._stats:dict[str, int] = {"runs": 0, "pipeline_hits": 0, "pipeline_misses": 0}
+
+        # Optional compiled backends are loaded now, not in the first request.
+        REG.warm_up()
+
+        super().__init__(str(self.socket_path), _RequestHandler)
+
+    def _pipeline(self, flow:list[dict]) -> list[blocks.Block]:
+        key = json.dumps(flow, sort_keys=True)
+        chain = self._pipelines.get(key)
+        if chain is not None:
+            self._pipelines.move_to_end(key)
+            self._stats["pipeline_hits"] += 1
+            return chain
+
+        self._stats["pipeline_misses"] += 1
+        chain = REG.build_flow(flow)
+        self._pipelines[key] = chain
+        if len(self._pipelines) > _PIPELINE_CACHE_SIZE:
+            self._pipelines.popitem(last=False)
+        return chain
+
+    def _segment(self, name:str) -> shared_memory.SharedMemory:
+        shm = self._segments.get(name)
+        if shm is not None:
+            self._segments.move_to_end(name)
+            return shm
+
+        shm = _attach_shm(name)
+        self._segments[name] = shm
+        if len(self._segments) > _SHM_CACHE_SIZE:
+            self._segments.popitem(last=False)[1].close()
+        return shm
+
+    def run_request(self, request:dict) -> dict:
+        """
+        Runs `request["flow"]` over the frame stored in `request["shm"]` and
+        writes the final image back into the same segment.
+        """
+
+        width, height = int(request["width"]), int(request["height"])
+        lazy = bool(request.get("lazy", False))
+
+        with self._run_lock:
+            start = time.perf_counter()
+            chain = self._pipeline(request["flow"])
+            shm = self._segment(request["shm"])
+            if shm.size < width * height:
+                raise ValueError(
+                    f"Shared memory segment ({shm.size} bytes) is smaller than "
+                    f"the frame ({width}x{height})."
+                )
+
+            frame = np.ndarray((height, width), dtype=np.uint8, buffer=shm.buf)
+            result = pipeline.run_pipeline(frame, chain, lazy=lazy)
+            if result.image is not frame:
+                np.copyto(frame, np.clip(result.image, 0, 255).astype(np.uint8, copy=False))
+            del frame
+
+            self._stats["runs"] += 1
+            elapsed = time.perf_counter() - start
+
+        return {
+            "ok": True,
+            "timings": result.timings,
+            "skipped": result.skipped,
+            "reports": [(i, name, REG.jsonable_report(r)) for i, name, r in result.reports],
+            "server_seconds": elapsed,
+        }
+
+    def release_segment(self, name:str) -> None:
+        """Detaches the shared-memory segment `name` (the client owns and unlinks it)."""
+
+        with self._run_lock:
+            shm = self._segments.pop(name, None)
+            if shm is not None:
+                shm.close()
+
+    def stats(self) -> dict:
+        """Returns the request counters and cache sizes."""
+
+        return {
+            **self._stats,
+            "pipelines": len(self._pipelines),
+            "segments": len(self._segments),
+        }
+
+    def server_close(self) -> None:
+        super().server_close()
+        for shm in self._segments.values():
+            shm.close()
+        self._segments.clear()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles one client connection: one JSON request per line, one JSON reply per line."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                reply = self._dispatch(request)
+            except Exception as e:
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+            if reply.get("shutdown"):
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+    def _dispatch(self, request:dict) -> dict:
+        op = request.get("op")
+        if op == "run":
+            return self.server.run_request(request)
+        if op == "ping":
+            return {"ok": True}
+        if op == "release":
+            self.server.release_segment(request["shm"])
+            return {"ok": True}
+        if op == "stats":
+            return {"ok": True, **self.server.stats()}
+        if op == "shutdown":
+            return {"ok": True, "shutdown": True}
+        raise ValueError(f"Unknown operation: {op!r}")
+
+
+class PipelineClient:
+    """
+    Client for `PipelineServer`.
+
+    The client owns one shared-memory frame buffer: write the input into the
+    array returned by `frame`, call `run`, and read the result from the same
+    array.
+
+    Methods:
+        - `frame`: Returns the (height, width) uint8 shared frame buffer.
+        - `run`: Runs a flow over the shared frame, in place.
+        - `ping` / `stats` / `shutdown_server`: Control requests.
+        - `close`: Releases the frame buffer and the connection.
+    """
+
+    def __init__(self, socket_path:str|Path=PIPELINE_SOCKET_PATH) -> None:
+        """Connects to the server listening on `socket_path`."""
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(str(socket_path))
+        self._file = self._sock.makefile("rwb")
+
+        self._shm:shared_memory.SharedMemory|None = None
+        self._frame:np.ndarray|None = None
+
+    def __enter__(self) -> "PipelineClient":
+        return self
+
+    def __exit__(self, *_args) -> None:
+        self.close()
+
+    def _request(self, payload:dict) -> dict:
+        self._file.write(json.dumps(payload).encode() + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Pipeline server closed the connection.")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error", "Pipeline server error."))
+        return reply
+
+    def frame(self, width:int, height:int) -> np.ndarray:
+        """
+        Returns the shared (height, width) uint8 frame buffer, (re)allocating
+        the segment only when the frame does not fit.
+        """
+
+        if self._shm is None or self._shm.size < width * height:
+            self._release_shm()
+            self._shm = shared_memory.SharedMemory(create=True, size=width * height)
+
+        if self._frame is None or self._frame.shape != (height, width):
+            self._frame = np.ndarray((height, width), dtype=np.uint8, buffer=self._shm.buf)
+        return self._frame
+
+    def run(self, flow:list[dict], lazy:bool=False) -> dict:
+        """
+        Runs `flow` over the current frame buffer; the result is written back
+        into the array returned by `frame`.
+
+        Return:
+            The server reply (per-block timings, skipped blocks, server time).
+        """
+
+        if self._frame is None:
+            raise RuntimeError("Call frame() and fill it before run().")
+
+        height, width = self._frame.shape
+        return self._request({
+            "op": "run",
+            "flow": flow,
+            "shm": self._shm.name,
+            "width": width,
+            "height": height,
+            "lazy": lazy,
+        })
+
+    def ping(self) -> None:
+        self._request({"op": "ping"})
+
+    def stats(self) -> dict:
+        return self._request({"op": "stats"})
+
+    def shutdown_server(self) -> None:
+        self._request({"op": "shutdown"})
+
+    def _release_shm(self) -> None:
+        if self._shm is None:
+            return
+        try:
+            self._request({"op": "release", "shm": self._shm.name})
+        except (OSError, RuntimeError):
+            pass
+        self._frame = None
+        try:
+            self._shm.close()
+        except BufferError:
+            pass    # o chamador ainda segura uma view do frame
+        self._shm.unlink()
+        self._shm = None
+
+    def close(self) -> None:
+        """Releases the shared frame buffer and closes the connection."""
+
+        self._release_shm()
+        try:
+            self._file.close()
+        except OSError:
+            pass    # servidor já encerrado
+        self._sock.close()
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
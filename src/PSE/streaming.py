@@ -0,0 +1,427 @@
+"""
+Streaming execution of a block flow over a continuous sequence of frames.
+
+Stages (producer-consumer, connected by bounded queues):
+    reader  : one thread pulling frames from a source (a growing RAW sequence
+              file or a directory watched for new RAW files);
+    workers : N threads, each one with its own block chain built from the
+              flow (blocks keep per-instance state), running the pipeline;
+    writer  : the calling thread, which puts results back in frame order
+              (reorder buffer) and appends them to the output RAW sequence.
+
+The queues are bounded, so a slow stage blocks the one before it
+(backpressure) instead of piling frames up in memory. numpy releases the GIL
+inside its array operations, so the workers run in parallel on multi-core
+machines.
+
+With telemetry recording on (`PSE.telemetry`), every frame is a span on the
+timeline of its worker thread and the queue depths are recorded as counters.
+"""
+
+# Native Modules:
+import fnmatch
+import os
+import queue
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# Internal Modules:
+import PSE.memory as MEM
+import PSE.pipeline as pipeline
+import PSE.registry as REG
+import PSE.telemetry as TEL
+
+# External Modules:
+import numpy as np
+
+
+DEFAULT_QUEUE_SIZE:int      = 8     # Frames waiting between two stages.
+DEFAULT_POLL_INTERVAL:float = 0.05  # Seconds between two checks of a growing source.
+DEFAULT_IDLE_TIMEOUT:float  = 2.0   # Seconds without new data before a source ends.
+DEFAULT_SETTLE_TIME:float   = 1.0   # Seconds an incomplete frame file may stay unchanged.
+
+
+def raw_sequence_frames(
+    file_path:str|Path,
+    width:int,
+    height:int,
+    stop_event:threading.Event|None=None,
+    poll_interval:float=DEFAULT_POLL_INTERVAL,
+    idle_timeout:float|None=DEFAULT_IDLE_TIMEOUT,
+) -> Iterator[np.ndarray]:
+    """
+    Yields the frames of a RAW sequence file (8-bit frames of `width` x `height`
+    stored back to back), following the file while it grows.
+
+    Parameters:
+        - file_path: Sequence file (may not exist yet when the stream starts).
+        - width / height: Frame dimensions in pixels.
+        - stop_event: Optional -> Ends the source when set.
+        - poll_interval: Optional -> Seconds between checks for new data.
+        - idle_timeout: Optional -> Ends the source after this many seconds
+        without new data (`None` waits until `stop_event` is set).
+    """
+
+    frame_size = int(width) * int(height)
+    if frame_size <= 0:
+        raise ValueError("Image width and height must be positive!")
+
+    file_path = Path(file_path)
+    buffer = bytearray()
+    last_data = time.perf_counter()
+    handle = None
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            if handle is None and file_path.exists():
+                handle = open(file_path, "rb")
+
+            data = handle.read(frame_size - len(buffer)) if handle is not None else b""
+            if data:
+                buffer += data
+                last_data = time.perf_counter()
+                if len(buffer) == frame_size:
+                    TEL.io_bytes("read", frame_size, file_path)
+                    yield np.frombuffer(bytes(buffer), dtype=np.uint8).reshape((height, width))
+                    buffer.clear()
+                continue
+
+            if idle_timeout is not None and time.perf_counter() - last_data > idle_timeout:
+                break
+            time.sleep(poll_interval)
+    finally:
+        if handle is not None:
+            handle.close()
+
+
+def directory_frames(
+    folder:str|Path,
+    width:int,
+    height:int,
+    stop_event:threading.Event|None=None,
+    pattern:str="*.raw",
+    poll_interval:float=DEFAULT_POLL_INTERVAL,
+    idle_timeout:float|None=DEFAULT_IDLE_TIMEOUT,
+    settle_time:float=DEFAULT_SETTLE_TIME,
+) -> Iterator[np.ndarray]:
+    """
+    Yields the RAW frames that appear in `folder`, in file name order.
+
+    Only names after the last handled one are considered (a high-water mark,
+    so nothing is kept per file), and a file is read once its size matches a
+    whole frame. A smaller file is waited for, since it may still be written;
+    a larger one, or one whose size stays the same for `settle_time` seconds
+    without matching a frame, is skipped with a `RuntimeWarning`.
+
+    Parameters:
+        - folder: Watched directory.
+        - width / height: Frame dimensions in pixels.
+        - stop_event: Optional -> Ends the source when set.
+        - pattern: Optional -> Glob pattern of the frame file names.
+        - poll_interval / idle_timeout: Optional -> See `raw_sequence_frames`.
+        - settle_time: Optional -> Seconds an incomplete file may stay
+        unchanged before it is skipped.
+    """
+
+    frame_size = int(width) * int(height)
+    if frame_size <= 0:
+        raise ValueError("Image width and height must be positive!")
+
+    folder = Path(folder)
+    high_water = ""                                 # last handled file name
+    waiting:tuple[str, int, float]|None = None      # (name, size, since) of an incomplete file
+    last_data = time.perf_counter()
+
+    while stop_event is None or not stop_event.is_set():
+        with os.scandir(folder) as entries:
+            names = sorted(
+                entry.name for entry in entries
+                if entry.name > high_water and fnmatch.fnmatch(entry.name, pattern) and entry.is_file()
+            )
+
+        progress = False
+        for name in names:
+            path = folder / name
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
+                continue
+
+            if size == frame_size:
+                data = path.read_bytes()
+                if len(data) == frame_size:
+                    high_water, waiting, progress = name, None, True
+                    last_data = time.perf_counter()
+                    TEL.io_bytes("read", frame_size, path)
+                    yield np.frombuffer(data, dtype=np.uint8).reshape((height, width))
+                    continue
+                size = len(data)
+
+            now = time.perf_counter()
+            if waiting is None or waiting[:2] != (name, size):
+                waiting = (name, size, now)
+            if size > frame_size or now - waiting[2] >= settle_time:
+                warnings.warn(
+                    f"Arquivo ignorado: {path} ({size} bytes, quadro de {frame_size} bytes)",
+                    RuntimeWarning,
+                )
+                high_water, waiting, progress = name, None, True
+                continue
+
+            # ainda sendo gravado: espera, mantendo a ordem dos nomes
+            break
+
+        if not progress:
+            if waiting is None and idle_timeout is not None and time.perf_counter() - last_data > idle_timeout:
+                break
+            time.sleep(poll_interval)
+
+
+class StreamStats:
+    """
+    Statistics of a streaming run.
+
+    Attributes:
+        - `frames`: Number of frames written.
+        - `failed`: Number of frames whose pipeline raised an error (not written).
+        - `elapsed`: Wall time (s) from the first frame read to the last one written.
+        - `latencies`: Per-frame seconds from the frame being read to being written.
+        - `max_input_depth` / `max_output_depth`: Largest observed queue depths.
+        - `workers`: Number of pipeline worker threads.
+        - `errors`: List of (frame index, exception).
+    """
+
+    def __init__(self, workers:int) -> None:
+        self.frames:int                 = 0
+        self.failed:int                 = 0
+        self.elapsed:float              = 0.0
+        self.latencies:list[float]      = []
+        self.max_input_depth:int        = 0
+        self.max_output_depth:int       = 0
+        self.workers:int                = workers
+        self.errors:list[tuple[int, Exception]] = []
+
+    @property
+    def fps(self) -> float:
+        """Sustained frames per second."""
+
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+    def latency_percentiles(self, percentiles:tuple[float, ...]=(50, 95, 99)) -> dict[float, float]:
+        """Frame latency percentiles, in seconds (empty when no frame was written)."""
+
+        if not self.latencies:
+            return {}
+        values = np.percentile(np.asarray(self.latencies), percentiles)
+        return dict(zip(percentiles, values.tolist()))
+
+    def summary(self) -> str:
+        """Human readable (Portuguese) summary of the run."""
+
+        lines = [
+            f"Quadros processados: {self.frames} ({self.failed} com erro), {self.workers} worker(s)",
+            f"Tempo total: {self.elapsed:.3f} s -> {self.fps:.1f} quadros/s",
+        ]
+        percentiles = self.latency_percentiles()
+        if percentiles:
+            lines.append("Latência: " + ", ".join(
+                f"p{p:g} = {value * 1000:.2f} ms" for p, value in percentiles.items()
+            ))
+        lines.append(
+            f"Profundidade máxima das filas: entrada {self.max_input_depth}, saída {self.max_output_depth}"
+        )
+        return "\n".join(lines)
+
+
+def run_stream(
+    frames:Iterable[np.ndarray],
+    flow:list[dict],
+    output_path:str|Path|None=None,
+    workers:int|None=None,
+    queue_size:int=DEFAULT_QUEUE_SIZE,
+    lazy:bool=False,
+    stop_event:threading.Event|None=None,
+    memory_budget:int|None=MEM.CONFIGURED,
+    skip_failed:bool=False,
+) -> StreamStats:
+    """
+    Runs `flow` over every frame of `frames` and writes the results in order.
+
+    Parameters:
+        - frames: Frame source (e.g. `raw_sequence_frames` / `directory_frames`).
+        - flow: List of {"block": name, "params": {...}} objects (see `PSE.registry`).
+        Sink blocks (RAW saving) are rejected: every worker would write the
+        same file; the ordered output is `output_path`.
+        - output_path: Optional -> RAW sequence file receiving the output frames
+        (8 bits, back to back, in input order); `None` discards them.
+        - workers: Optional -> Number of pipeline threads (default: CPU count).
+        - queue_size: Optional -> Capacity of the input and output queues.
+        - lazy: Optional -> Lazy pipeline execution (see `PSE.pipeline`).
+        - stop_event: Optional -> Stops reading new frames when set (frames
+        already read are still finished and written).
+        - memory_budget: Optional -> Memory budget in bytes of the whole stream
+        (`None` = unlimited; default: config.ini), split evenly between the
+        workers, since they run their pipelines at the same time.
+        - skip_failed: Optional -> Leaves frames whose pipeline failed out of
+        the output. By default a black frame takes their place, so output
+        frame `i` always comes from input frame `i`.
+
+    Return:
+        The `StreamStats` of the run.
+
+    Raises:
+        The first error of the frame source or of the output writing, after
+        every stage thread has stopped.
+    """
+
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    if queue_size <= 0:
+        raise ValueError("Queue size must be positive!")
+
+    # Fails early (in the calling thread) on an invalid flow.
+    chains = [REG.build_flow(flow) for _ in range(workers)]
+    sinks = sorted({type(block).__name__ for block in chains[0] if block.is_sink})
+    if sinks:
+        raise ValueError(
+            f"Blocos de gravação não podem ser usados no modo streaming ({', '.join(sinks)}): "
+            f"use o arquivo de saída da sequência."
+        )
+    # Loads the optional compiled backends before the first frame.
+    REG.warm_up()
+
+    if memory_budget == MEM.CONFIGURED:
+        memory_budget = MEM.configured_budget()
+    worker_budget = None if memory_budget is None else memory_budget // workers
+
+    stop_event = stop_event or threading.Event()
+    abort = threading.Event()       # set on an error of the writer: every stage stops
+    stats = StreamStats(workers)
+    inputs:queue.Queue = queue.Queue(maxsize=queue_size)
+    outputs:queue.Queue = queue.Queue(maxsize=queue_size)
+    reader_error:list[Exception] = []
+
+    def read() -> None:
+        try:
+            for index, frame in enumerate(frames):
+                if stop_event.is_set() or not _put(inputs, (index, time.perf_counter(), frame), abort):
+                    break
+                depth = inputs.qsize()
+                stats.max_input_depth = max(stats.max_input_depth, depth)
+                TEL.emit("queue", "input_queue", "counter", depth=depth)
+        except Exception as e:
+            reader_error.append(e)
+        finally:
+            for _ in range(workers):
+                _put(inputs, None, abort)
+
+    def work(chain:list) -> None:
+        while not abort.is_set():
+            try:
+                item = inputs.get(timeout=DEFAULT_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if item is None:
+                _put(outputs, None, abort)
+                return
+
+            index, start, frame = item
+            try:
+                with TEL.span("frame", "frame", index=index):
+                    result = pipeline.run_pipeline(frame, chain, lazy=lazy, memory_budget=worker_budget)
+                item = (index, start, result.image, None)
+            except Exception as e:
+                item = (index, start, np.zeros(frame.shape, dtype=np.uint8), e)
+            if not _put(outputs, item, abort):
+                return
+            depth = outputs.qsize()
+            stats.max_output_depth = max(stats.max_output_depth, depth)
+            TEL.emit("queue", "output_queue", "counter", depth=depth)
+
+    threads = [threading.Thread(target=read, name="pse-stream-reader", daemon=True)]
+    threads += [
+        threading.Thread(target=work, args=(chain,), name=f"pse-stream-worker-{i}", daemon=True)
+        for i, chain in enumerate(chains)
+    ]
+
+    output = None
+    if output_path is not None:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output = open(output_path, "wb")
+
+    first_start:float|None = None
+    pending:dict[int, tuple[float, np.ndarray, Exception|None]] = {}
+    next_index = 0
+    finished = 0
+
+    try:
+        for thread in threads:
+            thread.start()
+
+        while finished < workers:
+            item = outputs.get()
+            if item is None:
+                finished += 1
+                continue
+
+            index, start, image, error = item
+            pending[index] = (start, image, error)
+
+            # Reorder buffer: writes every consecutive frame that is ready.
+            while next_index in pending:
+                start, image, error = pending.pop(next_index)
+                first_start = start if first_start is None else min(first_start, start)
+
+                if error is not None:
+                    stats.failed += 1
+                    stats.errors.append((next_index, error))
+                if output is not None and (error is None or not skip_failed):
+                    # quadros com erro viram um quadro preto (mantém a posição)
+                    data = np.clip(image, 0, 255).astype(np.uint8).tobytes()
+                    output.write(data)
+                    TEL.io_bytes("write", len(data), output_path)
+                if error is None:
+                    stats.frames += 1
+                    stats.latencies.append(time.perf_counter() - start)
+                next_index += 1
+    except BaseException:
+        abort.set()
+        raise
+    finally:
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+        if output is not None:
+            output.close()
+
+    if first_start is not None:
+        stats.elapsed = time.perf_counter() - first_start
+    if reader_error:
+        raise reader_error[0]
+    return stats
+
+
+def _put(q:queue.Queue, item, abort:threading.Event) -> bool:
+    """
+    Puts `item` in the bounded queue `q`, waiting for room unless `abort` is
+    set (so no stage stays blocked on a queue nobody consumes anymore).
+
+    Return:
+        Whether the item was queued.
+    """
+
+    while not abort.is_set():
+        try:
+            q.put(item, timeout=DEFAULT_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
@@ -0,0 +1,348 @@
+"""
+Structured telemetry of pipeline runs.
+
+* While recording is enabled (`enable`, or config.ini [telemetry] events_file
+through `configure`), the instrumented points append one JSON object per line
+to a local events file: run and block spans (with the memory plan and the
+strips of tiled blocks), cache hits/misses, bytes read and written, streaming
+frames and queue depths. Several processes may append to the same file, so
+thousands of batch runs can be analyzed together.
+* Recording is off by default; `emit` and `span` then only check one global.
+* `to_chrome_trace` converts an events file to the Chrome trace event format
+(chrome://tracing, https://ui.perfetto.dev), with one timeline per thread, so
+parallel (streaming) and tiled executions can be inspected visually;
+`summarize` aggregates durations, cache hit rates and I/O for regression
+diagnosis.
+
+Event fields:
+    - `ts`: Wall clock time in microseconds (UNIX epoch).
+    - `pid` / `tid`: Process and native thread ids.
+    - `kind`: Event category ("run", "block", "tile", "frame", "cache", "io",
+    "spill", "queue", "thread").
+    - `name`: Event name (e.g. block class name, cache name).
+    - `phase`: "begin" / "end" (spans), "instant", "counter" or "meta".
+    - `dur`: Span duration in microseconds ("end" events only).
+    - `args`: Event specific data.
+"""
+
+# Native Modules:
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+# Internal Modules:
+from FileHandling.config_reading import read_config
+
+
+PHASES:tuple[str, ...] = ("begin", "end", "instant", "counter", "meta")
+
+_CHROME_PHASES:dict[str, str] = {"begin": "B", "end": "E", "instant": "i", "counter": "C"}
+
+_handle = None                      # Open events file while recording.
+_path:Path|None = None
+_lock = threading.Lock()
+_known_threads:set[tuple[int, int]] = set()
+_run_ids = itertools.count(1)
+
+
+def configured_events_file() -> Path|None:
+    """Events file from config.ini ([telemetry] events_file), `None` when disabled."""
+
+    events_file = read_config().get("telemetry", "events_file", fallback="").strip()
+    return Path(events_file) if events_file else None
+
+
+def enable(file_path:str|Path) -> None:
+    """
+    Starts recording to `file_path` (appended, created with its directory if
+    needed). Replaces any file being recorded.
+    """
+
+    global _handle, _path
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        if _handle is not None:
+            _handle.close()
+        _handle = open(file_path, "a", encoding="utf-8", buffering=1)
+        _path = file_path
+        _known_threads.clear()
+
+
+def disable() -> None:
+    """Stops recording and closes the events file."""
+
+    global _handle, _path
+    with _lock:
+        if _handle is not None:
+            _handle.close()
+        _handle = None
+        _path = None
+
+
+def configure(file_path:str|Path|None=None) -> Path|None:
+    """
+    Enables recording to `file_path`, or to the events file of config.ini
+    when `file_path` is `None` (nothing happens when neither is set).
+
+    Return:
+        The events file being recorded, `None` when recording is off.
+    """
+
+    file_path = file_path or configured_events_file()
+    if file_path is not None:
+        enable(file_path)
+    return _path
+
+
+def enabled() -> bool:
+    """Whether events are being recorded."""
+
+    return _handle is not None
+
+
+def events_file() -> Path|None:
+    """Events file being recorded, `None` when recording is off."""
+
+    return _path
+
+
+def next_run_id() -> int:
+    """Process-wide id of a new pipeline run (links block events to their run)."""
+
+    return next(_run_ids)
+
+
+def emit(kind:str, name:str, phase:str="instant", dur:int|None=None, **args) -> None:
+    """
+    Records one event (no-op while recording is off).
+
+    Parameters:
+        - kind / name / phase: See the module docstring.
+        - dur: Optional -> Span duration in microseconds.
+        - args: JSON-serializable event data.
+    """
+
+    if _handle is None:
+        return
+
+    ts = time.time_ns() // 1000
+    pid, tid = os.getpid(), threading.get_native_id()
+    event = {"ts": ts, "pid": pid, "tid": tid, "kind": kind, "name": name, "phase": phase}
+    if dur is not None:
+        event["dur"] = dur
+    if args:
+        event["args"] = args
+    line = json.dumps(event, ensure_ascii=False, default=str)
+
+    with _lock:
+        if _handle is None:
+            return
+        if (pid, tid) not in _known_threads:
+            _known_threads.add((pid, tid))
+            meta = {"ts": ts, "pid": pid, "tid": tid, "kind": "thread",
+                    "name": threading.current_thread().name, "phase": "meta"}
+            _handle.write(json.dumps(meta, ensure_ascii=False) + "\n")
+        _handle.write(line + "\n")
+
+
+class _NullSpan:
+    """Context manager of `span` while recording is off (no generator per call)."""
+
+    def __enter__(self) -> dict:
+        return {}
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(kind:str, name:str, **args):
+    """
+    Context manager that records a "begin" event, runs the body and records
+    the matching "end" event with the duration (and the error, if the body
+    raised).
+
+    The dict given by `with` is merged into the "end" event args, so the body
+    can attach results (e.g. the number of skipped blocks).
+
+    Usage:
+        >>> with span("block", "ConvolutionBlock", index=2) as end_args:
+        ...     end_args["strategy"] = "tiled"
+    """
+
+    if _handle is None:
+        return _NULL_SPAN
+    return _span(kind, name, args)
+
+
+@contextmanager
+def _span(kind:str, name:str, args:dict) -> Iterator[dict]:
+    end_args:dict = {}
+    emit(kind, name, "begin", **args)
+    start = time.perf_counter_ns()
+    try:
+        yield end_args
+    except BaseException as e:
+        end_args["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        emit(kind, name, "end", dur=(time.perf_counter_ns() - start) // 1000, **{**args, **end_args})
+
+
+def cache_access(cache:str, hit:bool) -> None:
+    """Records a hit or a miss of cache `cache`."""
+
+    if _handle is not None:
+        emit("cache", cache, hit=hit)
+
+
+def io_bytes(operation:str, nbytes:int, path:str|Path|None=None) -> None:
+    """Records `nbytes` bytes read or written (`operation` = "read" / "write")."""
+
+    if _handle is not None:
+        emit("io", operation, bytes=int(nbytes), path=None if path is None else str(path))
+
+
+#------------------------------- Export -------------------------------
+def read_events(file_path:str|Path) -> Iterator[dict]:
+    """
+    Yields the events of a JSONL events file (a truncated last line, left by a
+    process that was killed while writing, is ignored).
+    """
+
+    with open(file_path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def chrome_trace(events) -> dict:
+    """
+    Chrome trace event document ({"traceEvents": [...]}) of `events`.
+
+    Spans become begin/end ("B"/"E") slices on the timeline of their thread,
+    queue depths become counter tracks and the other events instant marks.
+    """
+
+    trace:list[dict] = []
+    for event in events:
+        phase = event.get("phase")
+        base = {"pid": event["pid"], "tid": event["tid"], "ts": event["ts"]}
+
+        if phase == "meta":
+            if event.get("kind") == "thread":
+                trace.append({**base, "ph": "M", "name": "thread_name", "args": {"name": event["name"]}})
+            continue
+
+        ph = _CHROME_PHASES.get(phase)
+        if ph is None:
+            continue
+
+        item = {**base, "ph": ph, "cat": event["kind"], "name": event["name"], "args": event.get("args", {})}
+        if ph == "i":
+            item["s"] = "t"
+        elif ph == "C":
+            item["args"] = {k: v for k, v in item["args"].items() if isinstance(v, (int, float))}
+        trace.append(item)
+
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def to_chrome_trace(events_path:str|Path, trace_path:str|Path) -> int:
+    """
+    Converts a JSONL events file to a Chrome trace event JSON file.
+
+    Return:
+        Number of trace events written.
+    """
+
+    document = chrome_trace(read_events(events_path))
+    trace_path = Path(trace_path)
+    trace_path.parent.mkdir(parents=True, exist_ok=True)
+    trace_path.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+    return len(document["traceEvents"])
+
+
+def summarize(events) -> dict:
+    """
+    Aggregates `events` for offline regression analysis.
+
+    Return:
+        A dict with:
+            - "spans": {(kind, name): {"count", "errors", "total_ms", "mean_ms",
+            "p50_ms", "p95_ms", "max_ms"}}, from the "end" events;
+            - "caches": {name: {"hits", "misses", "hit_rate"}};
+            - "io": {"read": bytes, "write": bytes};
+            - "max_queue": {queue name: largest depth}.
+    """
+
+    durations:dict[tuple[str, str], list[float]] = {}
+    errors:dict[tuple[str, str], int] = {}
+    caches:dict[str, list[int]] = {}
+    io = {"read": 0, "write": 0}
+    max_queue:dict[str, int] = {}
+
+    for event in events:
+        kind, phase, args = event.get("kind"), event.get("phase"), event.get("args", {})
+        if phase == "end":
+            key = (kind, event["name"])
+            durations.setdefault(key, []).append(event.get("dur", 0) / 1000)
+            if "error" in args:
+                errors[key] = errors.get(key, 0) + 1
+        elif kind == "cache":
+            counts = caches.setdefault(event["name"], [0, 0])
+            counts[0 if args.get("hit") else 1] += 1
+        elif kind == "io":
+            io[event["name"]] = io.get(event["name"], 0) + args.get("bytes", 0)
+        elif kind == "queue":
+            name = event["name"]
+            max_queue[name] = max(max_queue.get(name, 0), args.get("depth", 0))
+
+    spans = {}
+    for key, values in durations.items():
+        values.sort()
+        spans[key] = {
+            "count":    len(values),
+            "errors":   errors.get(key, 0),
+            "total_ms": sum(values),
+            "mean_ms":  sum(values) / len(values),
+            "p50_ms":   _percentile(values, 50),
+            "p95_ms":   _percentile(values, 95),
+            "max_ms":   values[-1],
+        }
+
+    return {
+        "spans":     spans,
+        "caches":    {
+            name: {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+            for name, (hits, misses) in caches.items()
+        },
+        "io":        io,
+        "max_queue": max_queue,
+    }
+
+
+def _percentile(sorted_values:list[float], percentile:float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+
+    rank = max(1, -(-len(sorted_values) * percentile // 100))
+    return sorted_values[int(rank) - 1]
+#----------------------------------------------------------------------
+
+
+# This is NOT a script file.
+if __name__ == '__main__':
+    raise RuntimeError("This module is not a standalone script.")
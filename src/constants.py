@@ -5,6 +5,7 @@ Constant values definition module.
 
 # Native Modules:
 from pathlib import Path
+from tempfile import gettempdir
 from typing import Final
 
 
@@ -14,10 +15,18 @@ PROJECT_NAME:Final[str] = "Processamento e Análise de Imagens - Trabalho práti
 _PROJECT_FILE_PATH:Path = (Path(__file__).parent.parent).resolve()  # Project file directory absolute path (as a pathlib Path object).
 INPUT_FOLDER_PATH:Path    = (_PROJECT_FILE_PATH / "input/").resolve()  # Image input file directory absolute path (as a pathlib Path object).
 OUTPUT_FOLDER_PATH:Path   = (_PROJECT_FILE_PATH / "output/").resolve() # Image output file directory absolute path (as a pathlib Path object).
+CONFIG_FILE_PATH:Path     = (_PROJECT_FILE_PATH / "config.ini").resolve() # General configuration file absolute path (as a pathlib Path object).
 
 TARGET_WIDTH:Final[int]     = 640 # Target image width for image conversion to raw file. 
 TARGET_HEIGHT:Final[int]    = 360 # Target image height for image conversion to raw file.
 
+PREVIEW_MAX_WIDTH:Final[int]    = 320 # Maximum preview width, the GUI preview runs on the first pyramid level that fits.
+PREVIEW_MAX_HEIGHT:Final[int]   = 240 # Maximum preview height, the GUI preview runs on the first pyramid level that fits.
+
+IMPORT_TIME_BUDGET_MS:Final[float] = 75.0  # Maximum import time (ms) of the core modules on top of numpy (see startup_benchmark.py).
+
+PIPELINE_SOCKET_PATH:Final[Path] = (Path(gettempdir()) / "pse_pipeline.sock")  # Default Unix socket path of the pipeline server.
+
 
 # This is NOT a script file.
 if __name__ == '__main__':
@@ -0,0 +1,60 @@
+"""
+Converts between headerless RAW files (8 bits, grayscale) and the chunked
+container format (.psec).
+
+Usage:
+    python convert_chunked.py <input.raw> <width> <height> <output.psec> [zlib|none]
+    python convert_chunked.py <input.psec> <output.raw>
+"""
+
+# Native Modules:
+import sys
+from pathlib import Path
+
+# Internal Modules:
+import FileHandling.chunked_format as CF
+import FileHandling.image_reading as IR
+
+
+def _raw_to_chunked(input_file_path:Path, width:int, height:int, output_file_path:Path, compression:str) -> None:
+    reader = IR.RawImageReader(input_file_path, width, height)
+    written = CF.write_chunked(output_file_path, reader.image, compression=compression)
+
+    print(f"Imagem de entrada: {input_file_path} ({width} x {height})")
+    print(f"Arquivo PSEC salvo em: {output_file_path} ({written} bytes, compressão: {compression})")
+
+
+def _chunked_to_raw(input_file_path:Path, output_file_path:Path) -> None:
+    reader = IR.ChunkedImageReader(input_file_path)
+    width, height = reader.dimensions
+
+    output_file_path.parent.mkdir(parents=True, exist_ok=True)
+    output_file_path.write_bytes(reader.image.tobytes())
+
+    print(f"Imagem de entrada: {input_file_path} ({width} x {height})")
+    print(f"Arquivo RAW salvo em: {output_file_path}")
+
+
+def main() -> None:
+    """"""
+
+    args = sys.argv[1:]
+    try:
+        if len(args) in (4, 5):
+            compression = args[4] if len(args) == 5 else "zlib"
+            _raw_to_chunked(Path(args[0]), int(args[1]), int(args[2]), Path(args[3]), compression)
+        elif len(args) == 2:
+            _chunked_to_raw(Path(args[0]), Path(args[1]))
+        else:
+            print("Uso:")
+            print("  python convert_chunked.py <input.raw> <largura> <altura> <output.psec> [zlib|none]")
+            print("  python convert_chunked.py <input.psec> <output.raw>")
+            sys.exit(1)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+# This is a script file and should NOT be imported:
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Starts the local pipeline server (Unix socket + shared memory).
+
+Usage:
+    python ./src/pipeline_server.py [socket_path]
+"""
+
+# Native Modules:
+import sys
+
+# Internal Modules:
+from constants import PIPELINE_SOCKET_PATH
+from PSE.server import PipelineServer
+import PSE.telemetry as TEL
+
+
+def main() -> None:
+    """
+    Runs the pipeline server until a client sends a "shutdown" request (or Ctrl+C).
+    """
+
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else PIPELINE_SOCKET_PATH
+    TEL.configure()     # grava telemetria se config.ini definir [telemetry] events_file
+
+    with PipelineServer(socket_path) as server:
+        print(f"Servidor de pipeline escutando em: {server.socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+# This is a script file and should NOT be imported:
+if __name__ == '__main__':
+    main()
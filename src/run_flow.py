@@ -0,0 +1,116 @@
+"""
+Runs a JSON block flow over one image, without the GUI.
+
+The flow file is the one saved by the GUI ("Salvar fluxo...") or accepted by
+the pipeline server and the streaming mode: a JSON list of
+{"block": name, "params": {...}} objects. Per-block timings and the block
+reports are printed, and the final image can be saved as RAW. The memory
+budget comes from config.ini unless `--memory-mb` is given (0 = unlimited).
+Telemetry events (see PSE/telemetry.py) are recorded to `--telemetry` or to
+the events file of config.ini.
+
+Usage:
+    python run_flow.py <flow.json> <input.raw|input.psec> [width height] [--output out.raw] [--lazy] [--memory-mb N]
+                       [--telemetry events.jsonl]
+    python run_flow.py --list
+"""
+
+# Native Modules:
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Internal Modules:
+import FileHandling.image_reading as IR
+import PSE.blocks  # registra os blocos no PSE.registry
+import PSE.memory as MEM
+import PSE.pipeline as pipeline
+import PSE.registry as REG
+import PSE.telemetry as TEL
+
+# External Modules:
+import numpy as np
+
+
+def _print_blocks() -> None:
+    """Prints every headless block of the registry with its parameters."""
+
+    for spec in REG.block_specs():
+        if not spec.headless:
+            continue
+        params = ", ".join(
+            f"{p.name} ({p.kind}" + ("" if p.default is None else f", padrão {p.default!r}") + ")"
+            for p in spec.params
+        )
+        print(f"{spec.name:<20} {spec.label}: {params or '-'}")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Executa um fluxo de blocos JSON sem interface gráfica.")
+    parser.add_argument("flow", type=Path, nargs="?", help="Arquivo JSON com o fluxo de blocos.")
+    parser.add_argument("input", type=Path, nargs="?", help="Imagem de entrada (.raw ou .psec).")
+    parser.add_argument("size", type=int, nargs="*", help="Largura e altura (somente .raw).")
+    parser.add_argument("--output", type=Path, default=None, help="Grava a imagem final (.raw).")
+    parser.add_argument("--lazy", action="store_true", help="Execução preguiçosa do pipeline.")
+    parser.add_argument("--memory-mb", type=float, default=None, help="Orçamento de memória em MiB (0 = ilimitado; padrão: config.ini).")
+    parser.add_argument(
+        "--telemetry", type=Path, default=None,
+        help="Grava os eventos de telemetria (JSONL) neste arquivo (padrão: config.ini).",
+    )
+    parser.add_argument("--list", action="store_true", help="Lista os blocos disponíveis e sai.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Reads the image, runs the flow and prints timings and reports.
+    """
+
+    args = _parse_args()
+    if args.list:
+        _print_blocks()
+        return
+
+    if args.flow is None or args.input is None or len(args.size) not in (0, 2):
+        print("Uso:")
+        print("  python run_flow.py <fluxo.json> <entrada.raw|entrada.psec> [largura altura] [--output saida.raw] [--lazy] [--memory-mb N]")
+        print("  python run_flow.py --list")
+        sys.exit(1)
+
+    try:
+        TEL.configure(args.telemetry)
+        width, height = args.size if args.size else (None, None)
+        reader = IR.open_image(args.input, width, height)
+        chain = REG.build_flow(REG.load_flow(args.flow))
+
+        if args.memory_mb is None:
+            budget = MEM.CONFIGURED
+        else:
+            budget = int(args.memory_mb * 1024 * 1024) if args.memory_mb > 0 else None
+        result = pipeline.run_pipeline(reader.source, chain, lazy=args.lazy, keep_output=True, memory_budget=budget)
+
+        if args.output is not None:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_bytes(np.clip(result.image, 0, 255).astype(np.uint8).tobytes())
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    for index, name, seconds in result.timings:
+        print(f"Bloco {index:>2} {name:<28} {seconds * 1000:9.2f} ms")
+    for index, name in result.skipped:
+        print(f"Bloco {index:>2} {name:<28} (não executado)")
+    for index, name, plan in result.memory:
+        print(f"Memória do bloco {index:>2} {name:<28} {plan.describe()}")
+    for index, name, report in result.reports:
+        print(f"Relatório do bloco {index} ({name}): {json.dumps(REG.jsonable_report(report), ensure_ascii=False)}")
+    if args.output is not None:
+        print(f"Imagem final salva em: {args.output}")
+    if TEL.enabled():
+        print(f"Eventos de telemetria gravados em: {TEL.events_file()}")
+
+
+# This is a script file and should NOT be imported:
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ Main script file, runs the project.
 
 # Internal Modules:
 import PSE.problem_solving_environment as PSE
+import PSE.telemetry as TEL
 
 
 def main() -> None:
@@ -13,6 +14,7 @@ def main() -> None:
     Starts GUI, all other functionalities are called from within the GUI implementation.
     """
 
+    TEL.configure()     # grava telemetria se config.ini definir [telemetry] events_file
     PSE.start()
 
 
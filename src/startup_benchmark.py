@@ -0,0 +1,84 @@
+"""
+Startup benchmark: checks that the core processing and I/O modules import
+only numpy (no MatPlotLib, Tkinter or Pillow) and stay within the import time
+budget defined in `constants.IMPORT_TIME_BUDGET_MS`.
+
+Usage:
+    python ./src/startup_benchmark.py [repetitions]
+"""
+
+# Native Modules:
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Internal Modules:
+from constants import IMPORT_TIME_BUDGET_MS
+
+
+CORE_MODULES:tuple[str, ...] = (
+    "FileHandling.image_reading",
+    "PSE.frequency",
+    "PSE.blocks",
+    "PSE.pipeline",
+    "PSE.server",
+)
+
+HEAVY_MODULES:tuple[str, ...] = ("matplotlib", "tkinter", "PIL")
+
+# Runs in a fresh interpreter: imports numpy (baseline), then the core modules.
+_PROBE:str = """
+import json, sys, time
+t0 = time.perf_counter()
+import numpy
+t1 = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+t2 = time.perf_counter()
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"numpy_ms": (t1 - t0) * 1e3, "core_ms": (t2 - t1) * 1e3, "heavy": heavy}}))
+"""
+
+
+def _measure_once() -> dict:
+    """Imports the core modules in a new interpreter and returns its measurements."""
+
+    code = _PROBE.format(modules=CORE_MODULES, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main() -> None:
+    """
+    Runs the probe several times and fails (exit code 1) if a heavy module was
+    imported or if the median import time of the core modules exceeds the budget.
+    """
+
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    runs = [_measure_once() for _ in range(repetitions)]
+
+    numpy_ms = statistics.median(r["numpy_ms"] for r in runs)
+    core_ms = statistics.median(r["core_ms"] for r in runs)
+    heavy = sorted({m for r in runs for m in r["heavy"]})
+
+    print(f"numpy:               {numpy_ms:7.1f} ms (mediana de {repetitions})")
+    print(f"módulos do núcleo:   {core_ms:7.1f} ms (orçamento {IMPORT_TIME_BUDGET_MS:.1f} ms)")
+    print(f"módulos pesados:     {', '.join(heavy) if heavy else 'nenhum'}")
+
+    if heavy or core_ms > IMPORT_TIME_BUDGET_MS:
+        print("FALHOU")
+        sys.exit(1)
+    print("OK")
+
+
+# This is a script file and should NOT be imported:
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Runs a block flow over a continuous stream of 8-bit RAW frames.
+
+The input is either a RAW sequence file (frames back to back, followed while
+it grows) or a directory watched for new .raw files. The output frames are
+appended, in input order, to a RAW sequence file: a frame whose flow fails is
+written as a black frame, so output frame `i` always comes from input frame
+`i` (`--skip-failed` leaves it out instead). Sustained frames/second and
+latency percentiles are printed at the end.
+
+The flow file is a JSON list of {"block": name, "params": {...}} objects, the
+same format accepted by the pipeline server (see PSE/server.py), without RAW
+saving blocks (the output sequence is the ordered output). Telemetry
+events (see PSE/telemetry.py) are recorded to `--telemetry` or to the events
+file of config.ini.
+
+Usage:
+    python stream_frames.py <flow.json> <input.raw|input_dir> <width> <height> [output.raw]
+                            [--workers N] [--queue N] [--idle SECONDS] [--lazy] [--skip-failed] [--memory-mb N]
+                            [--telemetry events.jsonl]
+"""
+
+# Native Modules:
+import argparse
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Internal Modules:
+import PSE.memory as MEM
+import PSE.streaming as ST
+import PSE.telemetry as TEL
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Processamento contínuo de quadros RAW (8 bits).")
+    parser.add_argument("flow", type=Path, help="Arquivo JSON com o fluxo de blocos.")
+    parser.add_argument("source", type=Path, help="Sequência RAW (arquivo) ou diretório observado.")
+    parser.add_argument("width", type=int, help="Largura dos quadros.")
+    parser.add_argument("height", type=int, help="Altura dos quadros.")
+    parser.add_argument("output", type=Path, nargs="?", default=None, help="Sequência RAW de saída.")
+    parser.add_argument("--workers", type=int, default=None, help="Threads de processamento (padrão: núcleos).")
+    parser.add_argument("--queue", type=int, default=ST.DEFAULT_QUEUE_SIZE, help="Capacidade das filas.")
+    parser.add_argument(
+        "--idle", type=float, default=ST.DEFAULT_IDLE_TIMEOUT,
+        help="Segundos sem quadros novos antes de encerrar (0 = esperar até Ctrl+C).",
+    )
+    parser.add_argument("--lazy", action="store_true", help="Execução preguiçosa do pipeline.")
+    parser.add_argument(
+        "--memory-mb", type=float, default=None,
+        help="Orçamento de memória do streaming em MiB, dividido entre os workers (0 = ilimitado; padrão: config.ini).",
+    )
+    parser.add_argument(
+        "--skip-failed", action="store_true",
+        help="Omite da saída os quadros com erro (padrão: quadro preto no lugar).",
+    )
+    parser.add_argument(
+        "--telemetry", type=Path, default=None,
+        help="Grava os eventos de telemetria (JSONL) neste arquivo (padrão: config.ini).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Streams the frames of the source through the flow until the source is idle
+    (or Ctrl+C).
+    """
+
+    args = _parse_args()
+    stop_event = threading.Event()
+    idle_timeout = args.idle if args.idle > 0 else None
+
+    if args.memory_mb is None:
+        memory_budget = MEM.CONFIGURED
+    else:
+        memory_budget = int(args.memory_mb * 1024 * 1024) if args.memory_mb > 0 else None
+
+    try:
+        TEL.configure(args.telemetry)
+        flow = json.loads(args.flow.read_text(encoding="utf-8"))
+        if args.source.is_dir():
+            frames = ST.directory_frames(args.source, args.width, args.height, stop_event, idle_timeout=idle_timeout)
+        else:
+            frames = ST.raw_sequence_frames(args.source, args.width, args.height, stop_event, idle_timeout=idle_timeout)
+
+        stats = ST.run_stream(
+            frames, flow, args.output,
+            workers=args.workers, queue_size=args.queue, lazy=args.lazy, stop_event=stop_event,
+            memory_budget=memory_budget, skip_failed=args.skip_failed,
+        )
+    except KeyboardInterrupt:
+        print("Interrompido.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(stats.summary())
+    for index, error in stats.errors[:5]:
+        print(f"Erro no quadro {index}: {error}")
+    if args.output is not None:
+        print(f"Sequência de saída salva em: {args.output}")
+    if TEL.enabled():
+        print(f"Eventos de telemetria gravados em: {TEL.events_file()}")
+
+
+# This is a script file and should NOT be imported:
+if __name__ == '__main__':
+    main()
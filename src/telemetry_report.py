@@ -0,0 +1,67 @@
+"""
+Summarizes a telemetry events file and exports it as a Chrome trace.
+
+The events file (JSONL) is written by the pipeline while telemetry recording
+is on (see PSE/telemetry.py): `--telemetry` of run_flow.py / stream_frames.py
+or [telemetry] events_file in config.ini. The summary lists the span
+durations (runs, blocks, strips of tiled blocks, streaming frames), the cache
+hit rates, the bytes read/written and the largest queue depths. The Chrome
+trace opens in chrome://tracing or https://ui.perfetto.dev.
+
+Usage:
+    python telemetry_report.py <events.jsonl> [--chrome trace.json]
+"""
+
+# Native Modules:
+import argparse
+import sys
+from pathlib import Path
+
+# Internal Modules:
+import PSE.telemetry as TEL
+
+
+def _print_summary(summary:dict) -> None:
+    """Prints the tables of `TEL.summarize`."""
+
+    print(f"{'Evento':<34} {'N':>6} {'erros':>5} {'total ms':>11} {'média':>9} {'p50':>9} {'p95':>9} {'máx':>9}")
+    for (kind, name), stats in sorted(summary["spans"].items(), key=lambda item: -item[1]["total_ms"]):
+        print(
+            f"{kind + ' ' + name:<34} {stats['count']:>6} {stats['errors']:>5} {stats['total_ms']:>11.2f} "
+            f"{stats['mean_ms']:>9.2f} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['max_ms']:>9.2f}"
+        )
+
+    for name, stats in sorted(summary["caches"].items()):
+        print(f"Cache {name}: {stats['hits']} acertos, {stats['misses']} faltas ({stats['hit_rate'] * 100:.1f}%)")
+    print(f"E/S: {summary['io'].get('read', 0)} bytes lidos, {summary['io'].get('write', 0)} bytes gravados")
+    for name, depth in sorted(summary["max_queue"].items()):
+        print(f"Profundidade máxima da fila {name}: {depth}")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Resumo e exportação dos eventos de telemetria do pipeline.")
+    parser.add_argument("events", type=Path, help="Arquivo JSONL de eventos.")
+    parser.add_argument("--chrome", type=Path, default=None, help="Exporta um trace do Chrome (JSON).")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Prints the summary of the events file and, optionally, exports the trace.
+    """
+
+    args = _parse_args()
+
+    try:
+        _print_summary(TEL.summarize(TEL.read_events(args.events)))
+        if args.chrome is not None:
+            count = TEL.to_chrome_trace(args.events, args.chrome)
+            print(f"Trace do Chrome com {count} eventos salvo em: {args.chrome}")
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+# This is a script file and should NOT be imported:
+if __name__ == '__main__':
+    main()